@@ -0,0 +1,170 @@
+"""
+Compare the ORM path and the fast path of the hot match pipelines.
+
+Run it from the project directory against a local Postgres that has the
+flux_orm schema and the CS2 sport::
+
+    python -m benchmarks.match_pipelines --matches 500
+
+Every row it creates has a ``bench-`` prefix and is deleted afterwards.
+"""
+
+import argparse
+import asyncio
+import logging
+from time import perf_counter
+from types import SimpleNamespace
+from typing import Any
+
+from flux_orm.database import new_session
+from flux_orm.models.models import Match, MatchStatus, Team
+from flux_orm.models.utils import utcnow_naive
+from scrapy.signalmanager import SignalManager
+from scrapy.statscollectors import StatsCollector
+from scrapy.utils.project import get_project_settings
+from sqlalchemy import delete, select
+
+from webnews_parser.pipelines import (
+    CSPastMatchesPostgresPipeline,
+    CSUpdateLiveScheduledMatchesPipeline,
+    upsert_matches,
+)
+
+PREFIX = "bench-"
+START = utcnow_naive().replace(microsecond=0)
+
+spider = SimpleNamespace(logger=logging.getLogger("benchmark"))
+
+
+def make_crawler(*, fast_path: bool) -> SimpleNamespace:
+    """Build the parts of a crawler the pipelines use."""
+    settings = get_project_settings()
+    settings.set("PIPELINE_FAST_PATH", fast_path)
+    crawler = SimpleNamespace(settings=settings, signals=SignalManager())
+    crawler.stats = StatsCollector(crawler)
+    return crawler
+
+
+def live_match_item(match_id: Any, number: int, score: int) -> dict[str, Any]:
+    """Build an item as scraped by CSUpdateLiveScheduledMatchesSpider."""
+    return {
+        "match_id": match_id,
+        "pretty_match_name": f"Bench match {number}",
+        "tournament_url": f"https://example.com/{PREFIX}tournament",
+        "match_streams": {"twitch": f"https://www.twitch.tv/{PREFIX}{number}"},
+        "match_status": "live",
+        "pretty_team1_name": f"Bench team {number % 20}",
+        "team1_name": f"{PREFIX}team-{number % 20}",
+        "team1_url": f"https://example.com/{PREFIX}team-{number % 20}",
+        "pretty_team2_name": f"Bench team {(number + 1) % 20}",
+        "team2_name": f"{PREFIX}team-{(number + 1) % 20}",
+        "team2_url": f"https://example.com/{PREFIX}team-{(number + 1) % 20}",
+        "team1_score": str(score),
+        "team2_score": "0",
+        "match_format": "Best of 3",
+    }
+
+
+def past_match_item(path: str, number: int, score: int) -> dict[str, Any]:
+    """Build an item as scraped by CSpMatchesSpider."""
+    return {
+        "external_id": f"{PREFIX}{path}-past-{number}",
+        "match_name": f"Bench past match {number}",
+        "date": START,
+        "team1_score": str(score),
+        "team2_score": "0",
+    }
+
+
+async def bench_live_matches(matches: int, rounds: int) -> None:
+    """Update the same live matches over and over with both paths."""
+    async with new_session() as session:
+        match_ids = await upsert_matches(
+            [
+                {
+                    "external_id": f"{PREFIX}live-{number}",
+                    "match_name": f"Bench match {number}",
+                    "match_url": f"https://example.com/{PREFIX}live-{number}",
+                    "planned_start_datetime": START,
+                }
+                for number in range(matches)
+            ],
+            session,
+        )
+        await session.commit()
+
+    for fast_path in (False, True):
+        pipeline = CSUpdateLiveScheduledMatchesPipeline(
+            make_crawler(fast_path=fast_path)
+        )
+        started = perf_counter()
+        for score in range(rounds):
+            for number in range(matches):
+                match_id = match_ids[f"{PREFIX}live-{number}"]
+                item = live_match_item(match_id, number, score)
+                await pipeline.store_item(item, spider)
+        report("live match updates", matches * rounds, started, fast_path=fast_path)
+
+
+async def bench_past_matches(matches: int, rounds: int) -> None:
+    """Insert past matches and update their results with both paths."""
+    for fast_path in (False, True):
+        path = "fast" if fast_path else "orm"
+        # Without open_spider nothing is flushed in the background, so every
+        # batch is written by process_item and the final flush
+        pipeline = CSPastMatchesPostgresPipeline(make_crawler(fast_path=fast_path))
+        started = perf_counter()
+        for score in range(rounds):
+            for number in range(matches):
+                item = past_match_item(path, number, score)
+                await pipeline.process_item(item, spider)
+        await pipeline.flush(spider)
+        report("past match results", matches * rounds, started, fast_path=fast_path)
+
+
+def report(name: str, items: int, started: float, *, fast_path: bool) -> None:
+    """Print the throughput of one run."""
+    elapsed = perf_counter() - started
+    path = "fast" if fast_path else "ORM"
+    rate = items / elapsed
+    print(f"{name:<20} {path:<5} {items:>7} items {elapsed:>8.2f}s {rate:>9.1f}/s")  # noqa: T201
+
+
+async def clean_up() -> None:
+    """Delete every row created by the benchmark."""
+    async with new_session() as session:
+        result = await session.execute(
+            select(Match.match_id).where(Match.external_id.startswith(PREFIX))
+        )
+        match_ids = result.scalars().all()
+        match_teams = Match.match_teams.property
+        status_fk = Match.match_status.property.local_remote_pairs[0][1]
+        await session.execute(
+            delete(match_teams.secondary).where(
+                match_teams.synchronize_pairs[0][1].in_(match_ids)
+            )
+        )
+        await session.execute(delete(MatchStatus).where(status_fk.in_(match_ids)))
+        await session.execute(delete(Match).where(Match.match_id.in_(match_ids)))
+        await session.execute(delete(Team).where(Team.name.startswith(PREFIX)))
+        await session.commit()
+
+
+async def main() -> None:
+    """Run the benchmarks and remove their rows."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--matches", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    await clean_up()
+    try:
+        await bench_live_matches(args.matches, args.rounds)
+        await bench_past_matches(args.matches, args.rounds)
+    finally:
+        await clean_up()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
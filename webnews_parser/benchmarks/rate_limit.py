@@ -0,0 +1,132 @@
+"""
+Compare concurrent jobs with and without the shared per-domain rate limiter.
+
+Every job is a set of workers hammering the same simulated site, which
+answers 429 once its request budget is spent. With the limiter each job has
+its own RateLimiter, as separate scrapyd processes would, but all of them
+draw tokens from the same Redis::
+
+    python -m benchmarks.rate_limit --jobs 4 --redis-url redis://localhost:6379/15
+
+The bucket key of the benchmark domain is deleted before every run.
+"""
+
+import argparse
+import asyncio
+import logging
+from dataclasses import dataclass
+from http import HTTPStatus
+from time import monotonic
+
+from redis.asyncio import Redis
+
+from webnews_parser.utils.rate_limit import RateLimiter
+
+DOMAIN = "bench.example.com"
+
+
+class Site:
+    """A site that allows ``rate`` requests per second with a ``burst``."""
+
+    def __init__(self, rate: float, burst: float) -> None:
+        """Start with a full budget."""
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = monotonic()
+
+    def request(self) -> int:
+        """Return the status code the site answers with."""
+        now = monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1:
+            return HTTPStatus.TOO_MANY_REQUESTS
+        self.tokens -= 1
+        return HTTPStatus.OK
+
+
+@dataclass
+class Result:
+    """Requests sent during one run."""
+
+    requests: int = 0
+    throttled: int = 0
+
+
+async def worker(
+    site: Site,
+    limiter: RateLimiter | None,
+    result: Result,
+    deadline: float,
+    args: argparse.Namespace,
+) -> None:
+    """Send requests until the deadline, backing off after every 429."""
+    while monotonic() < deadline:
+        if limiter:
+            await asyncio.sleep(await limiter.acquire(DOMAIN))
+        await asyncio.sleep(args.latency)
+        result.requests += 1
+        if site.request() == HTTPStatus.TOO_MANY_REQUESTS:
+            result.throttled += 1
+            await asyncio.sleep(args.backoff)
+
+
+async def run(args: argparse.Namespace, *, limited: bool) -> None:
+    """Run every job against a fresh site and print the outcome."""
+    site = Site(args.site_rate, args.site_burst)
+    limiters = [
+        RateLimiter(args.redis_url, {DOMAIN: args.site_rate}, 0, args.burst)
+        if limited
+        else None
+        for _ in range(args.jobs)
+    ]
+    result = Result()
+    started = monotonic()
+    deadline = started + args.duration
+    await asyncio.gather(
+        *(
+            worker(site, limiter, result, deadline, args)
+            for limiter in limiters
+            for _ in range(args.concurrency)
+        )
+    )
+    elapsed = monotonic() - started
+    for limiter in limiters:
+        if limiter:
+            await limiter.close()
+
+    pages = result.requests - result.throttled
+    name = "shared limiter" if limited else "no limiter"
+    print(  # noqa: T201
+        f"{name:<15} {result.requests:>6} requests "
+        f"{result.throttled / max(result.requests, 1):>7.1%} 429s "
+        f"{pages / elapsed:>7.2f} pages/s"
+    )
+
+
+async def main() -> None:
+    """Run the jobs without and then with the limiter."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15")
+    parser.add_argument("--jobs", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--site-rate", type=float, default=4)
+    parser.add_argument("--site-burst", type=float, default=5)
+    parser.add_argument("--burst", type=float, default=5)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--backoff", type=float, default=1)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    redis = Redis.from_url(args.redis_url)
+    await redis.delete(RateLimiter.KEY_PREFIX + DOMAIN)
+    await redis.aclose()
+
+    await run(args, limited=False)
+    await run(args, limited=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
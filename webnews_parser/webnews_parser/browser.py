@@ -0,0 +1,282 @@
+"""Long-lived Patchright browser shared by all requests of a crawler."""
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from time import monotonic
+from urllib.parse import urlparse
+from weakref import WeakKeyDictionary
+
+from patchright.async_api import (
+    async_playwright,
+    Browser,
+    BrowserContext,
+    CDPSession,
+    Page,
+    Playwright,
+)
+from scrapy import signals, Spider
+from scrapy.crawler import Crawler
+from scrapy.utils.defer import deferred_from_coro
+
+from .render_timings import timed
+from .storage_state import StorageStateStore
+
+_pools: WeakKeyDictionary = WeakKeyDictionary()
+
+# Sent with ``pool`` every time a pool launched its browser, also after a
+# restart.
+browser_launched = object()
+
+# Network.setBlockedURLs only matches URLs, so resource types are blocked by
+# their file extensions.
+RESOURCE_TYPE_EXTENSIONS = {
+    "image": ["png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico"],
+    "font": ["woff", "woff2", "ttf", "otf", "eot"],
+    "stylesheet": ["css"],
+    "media": ["mp4", "webm", "mp3", "ogg", "m3u8"],
+}
+
+
+class BrowserSlot:
+    """A browser context with a single page, handed out by the pool."""
+
+    def __init__(self, context: BrowserContext, page: Page, cdp: CDPSession) -> None:
+        """Wrap a freshly created context, its page and its CDP session."""
+        self.context = context
+        self.page = page
+        self.cdp = cdp
+        self.blocked_urls: list[str] | None = None
+        self.navigations = 0
+        self.failed = False
+
+
+class BrowserPool:
+    """
+    One browser per crawler with a bounded pool of contexts.
+
+    The browser is launched on ``spider_opened`` and closed on ``spider_closed``.
+    Every slot is a context with one page; a slot is recycled after
+    ``PATCHRIGHT_MAX_NAVIGATIONS_PER_CONTEXT`` navigations or when a request
+    using it fails.
+
+    Unwanted subrequests are blocked by the browser itself through CDP's
+    ``Network.setBlockedURLs``: the resource types in the spider's
+    ``blocked_resources`` and every domain of ``PATCHRIGHT_BLOCKED_DOMAINS``.
+    Nothing is blocked on pages of ``PATCHRIGHT_BLOCKING_EXEMPT_DOMAINS``.
+    Blocked requests are counted as ``patchright/blocked/<type>``; the bytes
+    they would have cost are unknown, as the browser never requests them.
+
+    New contexts start with the cookies and localStorage saved by earlier
+    contexts, see ``StorageStateStore``.
+    """
+
+    def __init__(self, crawler: Crawler) -> None:
+        """Read the pool configuration from the crawler settings."""
+        settings = crawler.settings
+        self.stats = crawler.stats
+        self.signals = crawler.signals
+        self.max_contexts = settings.getint(
+            "PATCHRIGHT_MAX_CONTEXTS", settings.getint("CONCURRENT_REQUESTS")
+        )
+        self.max_navigations = settings.getint("PATCHRIGHT_MAX_NAVIGATIONS_PER_CONTEXT")
+        self.default_timeout = settings.getint("PATCHRIGHT_DEFAULT_TIMEOUT")
+        self.headless = settings.getbool("PATCHRIGHT_HEADLESS")
+        self.blocked_domains = settings.getlist("PATCHRIGHT_BLOCKED_DOMAINS")
+        self.exempt_domains = settings.getlist("PATCHRIGHT_BLOCKING_EXEMPT_DOMAINS")
+        self.blocked_urls: list[str] | None = None
+        self.states = StorageStateStore(crawler)
+        self.spider: Spider | None = None
+
+        self._playwright: Playwright | None = None
+        self._browser: Browser | None = None
+        self._idle: list[BrowserSlot] = []
+        self._semaphore = asyncio.Semaphore(self.max_contexts)
+        self._start_lock = asyncio.Lock()
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "BrowserPool":
+        """Return the pool of the crawler, creating it on first use."""
+        pool = _pools.get(crawler)
+        if pool is None:
+            pool = cls(crawler)
+            _pools[crawler] = pool
+            crawler.signals.connect(pool.spider_opened, signal=signals.spider_opened)
+            crawler.signals.connect(pool.spider_closed, signal=signals.spider_closed)
+        return pool
+
+    @staticmethod
+    def existing(crawler: Crawler) -> "BrowserPool | None":
+        """Return the pool of the crawler if a component already created it."""
+        return _pools.get(crawler)
+
+    def spider_opened(self, spider: Spider):
+        """Launch the browser for the opened spider."""
+        self.spider = spider
+        return deferred_from_coro(self.start())
+
+    def spider_closed(self, spider: Spider):  # noqa: ARG002
+        """Shut the browser down together with the spider."""
+        return deferred_from_coro(self.close())
+
+    async def start(self) -> None:
+        """Launch the browser unless it is already running."""
+        async with self._start_lock:
+            if self._browser and self._browser.is_connected():
+                return
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            self._idle.clear()
+            self._browser = await self._playwright.chromium.launch(
+                headless=self.headless,
+                channel="chromium",
+                args=self.spider.browser_args,
+            )
+            self.stats.inc_value("patchright/browser/launched")
+            self.signals.send_catch_log(signal=browser_launched, pool=self)
+
+    async def close(self) -> None:
+        """Close every context, the browser and the Playwright driver."""
+        started = monotonic()
+        for slot in self._idle:
+            await self._close_slot(slot)
+        self._idle.clear()
+        if self._browser:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+        await self.states.close()
+        self.stats.set_value("patchright/browser/shutdown_time", monotonic() - started)
+
+        hits = self.stats.get_value("patchright/pool/hits", 0)
+        misses = self.stats.get_value("patchright/pool/misses", 0)
+        if hits + misses:
+            self.stats.set_value("patchright/pool/hit_rate", hits / (hits + misses))
+
+    async def restart(self) -> None:
+        """
+        Close the browser once every slot is back in the pool.
+
+        New requests wait meanwhile; the first of them launches a fresh
+        browser.
+        """
+        for _ in range(self.max_contexts):
+            await self._semaphore.acquire()
+        try:
+            for slot in self._idle:
+                await self._close_slot(slot)
+            self._idle.clear()
+            if self._browser:
+                await self._browser.close()
+                self._browser = None
+            self.stats.inc_value("patchright/browser/restarted")
+        finally:
+            for _ in range(self.max_contexts):
+                self._semaphore.release()
+
+    @asynccontextmanager
+    async def slot(
+        self, timings: dict[str, float] | None = None
+    ) -> AsyncIterator[BrowserSlot]:
+        """
+        Borrow a context and its page for one navigation.
+
+        The slot is marked as failed if the body raises, so it is closed
+        instead of being returned to the pool. The time spent acquiring and
+        releasing the slot is added to ``timings`` if given.
+        """
+        slot = await self.acquire(timings)
+        try:
+            yield slot
+        except BaseException:
+            slot.failed = True
+            raise
+        finally:
+            with timed(timings, "release"):
+                await self.release(slot)
+
+    async def acquire(self, timings: dict[str, float] | None = None) -> BrowserSlot:
+        """Wait for a free slot, reusing an idle context when possible."""
+        started = monotonic()
+        with timed(timings, "pool_wait"):
+            await self._semaphore.acquire()
+        waited = monotonic() - started
+        self.stats.inc_value("patchright/pool/wait_time", waited)
+        self.stats.max_value("patchright/pool/max_wait_time", waited)
+
+        try:
+            if not self._browser or not self._browser.is_connected():
+                with timed(timings, "launch"):
+                    await self.start()
+            if self._idle:
+                self.stats.inc_value("patchright/pool/hits")
+                return self._idle.pop()
+            self.stats.inc_value("patchright/pool/misses")
+            with timed(timings, "context"):
+                return await self._new_slot()
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+    async def release(self, slot: BrowserSlot) -> None:
+        """Return a slot to the pool or close it if it has to be recycled."""
+        try:
+            slot.navigations += 1
+            if slot.failed or slot.navigations >= self.max_navigations:
+                self.stats.inc_value("patchright/pool/recycled")
+                await self._close_slot(slot)
+            else:
+                self._idle.append(slot)
+        finally:
+            self._semaphore.release()
+
+    async def block(self, slot: BrowserSlot, url: str) -> None:
+        """Set the URLs the slot blocks while loading the page at ``url``."""
+        hostname = urlparse(url).hostname or ""
+        exempt = any(
+            hostname == domain or hostname.endswith(f".{domain}")
+            for domain in self.exempt_domains
+        )
+        blocked_urls = [] if exempt else self._blocked_urls()
+        if blocked_urls != slot.blocked_urls:
+            await slot.cdp.send("Network.setBlockedURLs", {"urls": blocked_urls})
+            slot.blocked_urls = blocked_urls
+
+    def _blocked_urls(self) -> list[str]:
+        if self.blocked_urls is None:
+            self.blocked_urls = [
+                pattern
+                for resource_type in getattr(self.spider, "blocked_resources", [])
+                for extension in RESOURCE_TYPE_EXTENSIONS.get(resource_type, [])
+                for pattern in (f"*.{extension}", f"*.{extension}?*")
+            ] + [f"*://*{domain}/*" for domain in self.blocked_domains]
+        return self.blocked_urls
+
+    def _loading_failed(self, event: dict) -> None:
+        if event.get("blockedReason") != "inspector":
+            return
+        self.stats.inc_value("patchright/blocked/count")
+        resource_type = event.get("type", "Other").lower()
+        self.stats.inc_value(f"patchright/blocked/{resource_type}")
+
+    async def _new_slot(self) -> BrowserSlot:
+        context = await self._browser.new_context(
+            user_agent=self.spider.user_agent,
+            locale="en-US",
+            no_viewport=True,
+            storage_state=await self.states.load(),
+        )
+        context.set_default_timeout(self.default_timeout)
+        page = await context.new_page()
+        cdp = await context.new_cdp_session(page)
+        cdp.on("Network.loadingFailed", self._loading_failed)
+        await cdp.send("Network.enable")
+        return BrowserSlot(context, page, cdp)
+
+    async def _close_slot(self, slot: BrowserSlot) -> None:
+        try:
+            await slot.context.close()
+        except Exception as e:  # noqa: BLE001
+            self.spider.logger.debug(f"Failed to close browser context: {e}")
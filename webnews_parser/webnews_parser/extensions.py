@@ -0,0 +1,253 @@
+"""Scrapy extensions of the project."""
+
+import json
+import logging
+import os
+import signal
+from os import getenv
+from pathlib import Path
+
+from scrapy import signals, Spider
+from scrapy.crawler import Crawler
+from scrapy.exceptions import NotConfigured
+from scrapy.utils.defer import deferred_from_coro
+from scrapy.utils.project import data_path
+from twisted.internet import task
+from twisted.internet.defer import Deferred
+
+from .browser import browser_launched, BrowserPool
+from .utils.db_utils import reference_cache
+from .utils.processes import (
+    descendants,
+    PROC,
+    Process,
+    process_table,
+    rss_bytes,
+)
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+
+class ReferenceDataCacheExtension:
+    """Warm up the reference data cache and report how much it saved."""
+
+    def __init__(self, crawler: Crawler) -> None:
+        """Configure the cache from the crawler settings."""
+        self.stats = crawler.stats
+        reference_cache.ttl = crawler.settings.getfloat("REFERENCE_CACHE_TTL")
+        self._hits = reference_cache.hits
+        self._misses = reference_cache.misses
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "ReferenceDataCacheExtension":
+        """Create the extension and connect it to the spider signals."""
+        extension = cls(crawler)
+        crawler.signals.connect(extension.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(extension.spider_closed, signal=signals.spider_closed)
+        return extension
+
+    def spider_opened(self, spider: Spider):  # noqa: ARG002
+        """Load the reference data before the first item is processed."""
+        return deferred_from_coro(reference_cache.warm_up())
+
+    def spider_closed(self, spider: Spider) -> None:
+        """Write the cache hit and miss counts of this crawl to the stats."""
+        self.stats.set_value(
+            "refdata/queries_avoided", reference_cache.hits - self._hits, spider=spider
+        )
+        self.stats.set_value(
+            "refdata/queries", reference_cache.misses - self._misses, spider=spider
+        )
+
+
+class ChromiumWatchdogExtension:
+    """
+    Keep the memory and the leftover processes of Chromium in check.
+
+    The extension only watches a ``BrowserPool`` that a component of the
+    crawler, like ``PatchrightMiddleware``, already created, so spiders that
+    never render do not launch a browser for it.
+
+    Every ``CHROMIUM_WATCHDOG_INTERVAL`` seconds the RSS of every Chromium
+    process started by this crawler is summed up. When the sum exceeds
+    ``CHROMIUM_WATCHDOG_MAX_RSS_MB``, the browser of the pool is restarted
+    once its in-flight pages are done. The peak and the average are written
+    to the stats when the spider closes.
+
+    The PIDs of the Chromium and driver processes are recorded in a file per
+    job (``SCRAPY_JOB``, or the PID of the crawler process) in
+    ``CHROMIUM_WATCHDOG_PID_DIR`` whenever the browser is launched and on
+    every sample. When a crawl starts and after it stopped, the recorded
+    processes of jobs that are no longer running are killed; processes of
+    running jobs are never touched. Linux only, as processes are read from
+    /proc.
+    """
+
+    def __init__(self, crawler: Crawler) -> None:
+        """Read the watchdog configuration from the crawler settings."""
+        settings = crawler.settings
+        self.crawler = crawler
+        self.interval = settings.getfloat("CHROMIUM_WATCHDOG_INTERVAL")
+        self.max_rss = settings.getint("CHROMIUM_WATCHDOG_MAX_RSS_MB") * MB
+        self.pid_dir = Path(
+            data_path(settings["CHROMIUM_WATCHDOG_PID_DIR"], createdir=True)
+        )
+        job = getenv("SCRAPY_JOB") or os.getpid()
+        self.pid_file = self.pid_dir / f"{job}.json"
+        self.pool: BrowserPool | None = None
+        self.stats = crawler.stats
+        self.samples = 0
+        self.total_rss = 0
+        self.peak_rss = 0
+        self._recorded: set[int] = set()
+        self._task = task.LoopingCall(self._check)
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "ChromiumWatchdogExtension":
+        """Create the extension and connect it to the crawler signals."""
+        if not crawler.settings.getbool("CHROMIUM_WATCHDOG_ENABLED"):
+            raise NotConfigured
+        if not PROC.is_dir():
+            raise NotConfigured("ChromiumWatchdogExtension needs /proc")
+        extension = cls(crawler)
+        crawler.signals.connect(extension.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(extension.spider_closed, signal=signals.spider_closed)
+        crawler.signals.connect(extension.engine_stopped, signal=signals.engine_stopped)
+        crawler.signals.connect(extension.browser_launched, signal=browser_launched)
+        return extension
+
+    def spider_opened(self, spider: Spider) -> None:  # noqa: ARG002
+        """Reap the browsers of dead jobs and start sampling."""
+        reaped = self.reap_orphans()
+        if reaped:
+            self.stats.inc_value("chromium/reaped", reaped)
+        self.pool = BrowserPool.existing(self.crawler)
+        if self.pool is not None:
+            self._task.start(self.interval, now=False)
+
+    def spider_closed(self, spider: Spider) -> None:
+        """Stop sampling and write the browser memory to the stats."""
+        if self._task.running:
+            self._task.stop()
+        if self.samples:
+            self.stats.set_value(
+                "chromium/rss/peak_mb", round(self.peak_rss / MB), spider=spider
+            )
+            self.stats.set_value(
+                "chromium/rss/avg_mb",
+                round(self.total_rss / self.samples / MB),
+                spider=spider,
+            )
+
+    def engine_stopped(self) -> None:
+        """
+        Reap the processes the closed browser of this job may have left behind.
+
+        The stats are already closed by now, so the kills are only logged.
+        """
+        self._reap(self.pid_file)
+        self.reap_orphans()
+
+    def browser_launched(self, pool: BrowserPool) -> None:  # noqa: ARG002
+        """Record the processes of a browser as soon as it is running."""
+        self._record({process.pid for process in self._browser_processes()})
+
+    def reap_orphans(self) -> int:
+        """Kill the recorded browser processes of every job that is gone."""
+        reaped = 0
+        processes = process_table()
+        for pid_file in self.pid_dir.glob("*.json"):
+            if pid_file == self.pid_file:
+                continue
+            try:
+                owner = json.loads(pid_file.read_text(encoding="utf-8"))["owner"]
+            except (OSError, ValueError, KeyError):
+                continue
+            if owner not in processes:
+                reaped += self._reap(pid_file, processes)
+        return reaped
+
+    @staticmethod
+    def _reap(pid_file: Path, processes: dict[int, Process] | None = None) -> int:
+        """Kill the recorded processes that are still browsers, return how many."""
+        try:
+            recorded = json.loads(pid_file.read_text(encoding="utf-8"))["pids"]
+        except (OSError, ValueError, KeyError):
+            return 0
+        if processes is None:
+            processes = process_table()
+
+        uid = os.getuid()
+        reaped = 0
+        for pid in recorded:
+            process = processes.get(pid)
+            # The PID may have been reused by an unrelated process meanwhile
+            if (
+                process is None
+                or process.uid != uid
+                or not (process.is_chromium or process.is_driver)
+            ):
+                continue
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except OSError:
+                continue
+            logger.warning(f"Killed orphaned browser process {pid}")
+            reaped += 1
+        pid_file.unlink(missing_ok=True)
+        return reaped
+
+    def sample(self) -> int:
+        """
+        Return the RSS of the Chromium processes of this crawler.
+
+        The PIDs of the browser and driver processes are recorded on the way.
+
+        Returns:
+            int: Summed RSS in bytes; shared pages count once per process.
+
+        """
+        browser = self._browser_processes()
+        self._record({process.pid for process in browser})
+        processes = [process for process in browser if process.is_chromium]
+        rss = sum(rss_bytes(process.pid) for process in processes)
+        self.samples += 1
+        self.total_rss += rss
+        self.peak_rss = max(self.peak_rss, rss)
+        self.stats.max_value("chromium/processes/max", len(processes))
+        return rss
+
+    @staticmethod
+    def _browser_processes() -> list[Process]:
+        return [
+            process
+            for process in descendants(os.getpid(), process_table())
+            if process.is_chromium or process.is_driver
+        ]
+
+    def _record(self, pids: set[int]) -> None:
+        """Write the PIDs to the PID file of this job when they changed."""
+        # Keep exited PIDs until the job ends, a restart may leave them behind
+        pids |= self._recorded
+        if pids == self._recorded:
+            return
+        data = json.dumps({"owner": os.getpid(), "pids": sorted(pids)})
+        try:
+            self.pid_file.write_text(data, encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"Failed to record the browser PIDs: {e}")
+            return
+        self._recorded = pids
+
+    def _check(self) -> Deferred | None:
+        rss = self.sample()
+        if self.max_rss and rss > self.max_rss:
+            logger.info(
+                f"Chromium uses {rss // MB} MB, more than {self.max_rss // MB} MB,"
+                " restarting it"
+            )
+            self.stats.inc_value("chromium/recycled")
+            return deferred_from_coro(self.pool.restart())
+        return None
@@ -0,0 +1,28 @@
+"""Policy of Scrapy's HTTP cache for pages that may be escalated to the browser."""
+
+from scrapy import Request
+from scrapy.extensions.httpcache import DummyPolicy
+from scrapy.http import Response
+
+from .utils.spider_utils import is_challenge_page, is_selector_present
+
+
+class ChallengeAwarePolicy(DummyPolicy):
+    """
+    ``DummyPolicy`` that never stores pages the browser has to render again.
+
+    Plain HTTP attempts of ``"auto"`` and ``"handoff"`` requests can get an
+    anti-bot challenge, or a page without ``request.meta["ready_selector"]``,
+    which ``PatchrightMiddleware`` escalates to the browser. Entries never
+    expire with ``HTTPCACHE_EXPIRATION_SECS = 0``, so storing such a page
+    would replay it on every later run.
+    """
+
+    def should_cache_response(self, response: Response, request: Request) -> bool:
+        """Check the status like ``DummyPolicy`` and skip unusable pages."""
+        if not super().should_cache_response(response, request):
+            return False
+        if is_challenge_page(response):
+            return False
+        ready_selector = request.meta.get("ready_selector")
+        return not ready_selector or is_selector_present(ready_selector, response)
@@ -86,7 +86,7 @@ class CSCreateLiveScheduledMatchesItem(Item):
 
 
 class CSUpdateTournamentsItem(Item):
-    match_id = Field()
+    match_ids = Field()
     tournament_name = Field()
     tournament_location = Field()
     tournament_logo_link = Field()
@@ -42,6 +42,7 @@ class CSCreateLiveScheduledMatchesLoader(ItemLoader):
 class CSUpdateTournamentsLoader(ItemLoader):
     default_output_processor = TakeFirst()
 
+    match_ids_out = Identity()
     tournament_name_in = MapCompose(str.strip)
     tournament_location_in = MapCompose(str.strip)
     tournament_logo_link_in = MapCompose(str.strip)
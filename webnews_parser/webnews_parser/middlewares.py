@@ -1,201 +1,589 @@
 import asyncio
+import heapq
+import json
+import re
+from itertools import count
+from time import monotonic, time
+from weakref import WeakKeyDictionary
 
-from flux_orm.database import new_session
-from flux_orm.models.models import RawNews
 from patchright._impl import _errors
-from patchright.async_api import async_playwright
+from scrapy import signals
 from scrapy.downloadermiddlewares.retry import RetryMiddleware
-from scrapy.exceptions import IgnoreRequest
-from scrapy.http import HtmlResponse
+from scrapy.exceptions import DontCloseSpider, IgnoreRequest, NotConfigured
+from scrapy.http import HtmlResponse, TextResponse
+from scrapy.utils.defer import deferred_from_coro
+from scrapy.utils.httpobj import urlparse_cached
 from scrapy.utils.response import response_status_message
-from sqlalchemy import select
-
-
-async def block_images_and_unnecessary_elements(route, spider):
+from twisted.internet import task
+
+from .browser import BrowserPool
+from .render_cache import RenderCache
+from .render_timings import RenderTimings, timed
+from .utils.rate_limit import RateLimiter
+from .utils.spider_utils import (
+    is_challenge_body,
+    is_challenge_page,
+    is_selector_present,
+)
+
+READY_TEXT_PREDICATE = """
+([selector, text]) => {
+    const node = selector.startsWith("xpath=")
+        ? document.evaluate(
+            selector.slice(6), document, null,
+            XPathResult.FIRST_ORDERED_NODE_TYPE, null,
+        ).singleNodeValue
+        : document.querySelector(selector);
+    return !!node && node.textContent.includes(text);
+}
+"""
+
+EXTRACT_FIELDS_SCRIPT = """
+(fields) => {
+    const select = (selector) => {
+        if (!selector.startsWith("xpath=")) {
+            return Array.from(document.querySelectorAll(selector));
+        }
+        const result = document.evaluate(
+            selector.slice(6), document, null,
+            XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null,
+        );
+        return Array.from(
+            {length: result.snapshotLength}, (_, i) => result.snapshotItem(i),
+        );
+    };
+    const read = (node, suffix) => {
+        if (suffix === "text") {
+            const text = Array.from(node.childNodes)
+                .find((child) => child.nodeType === Node.TEXT_NODE);
+            return text ? text.data : null;
+        }
+        if (suffix.startsWith("attr(")) {
+            return node.getAttribute(suffix.slice(5, -1));
+        }
+        return node.textContent;
+    };
+    const data = {};
+    for (const [name, selector, suffix, many] of fields) {
+        const values = select(selector).map((node) => read(node, suffix))
+            .filter((value) => value !== null);
+        data[name] = many ? values : (values[0] ?? null);
+    }
+    return data;
+}
+"""
+
+
+_rate_limits: WeakKeyDictionary = WeakKeyDictionary()
+
+
+class RateLimitMiddleware:
     """
-    Asynchronously block certain resource types based on spider configuration.
-
-    Args:
-        route: The route object from Playwright.
-        spider: The spider instance containing blocked_resources configuration.
-
-    Returns:
-        None
-
+    Hold requests back until their domain has budget left.
+
+    The budget is shared with every other job through ``RateLimiter``, so
+    overlapping spiders no longer add up to more requests than a site allows.
+    Only requests that go to the network take a token: this middleware runs
+    after ``TooManyRequestsRetryMiddleware`` and ``PatchrightMiddleware``, so
+    it never sees requests for paused domains or pages served from the render
+    cache, and ``PatchrightMiddleware`` waits through it before rendering.
     """
-    blocked_resources = spider.blocked_resources
-    if "hltv.org" in route.request.url:
-        blocked_resources = []
-    if route.request.resource_type in blocked_resources:
-        await route.abort()
-    else:
-        await route.continue_()
-
-
-async def start_playwright(
-    spider,
-    headless=True,
-    channel="chromium",
-    enable_js=True,
-    wait_for_storage_state=True,
-):
-    """
-    Asynchronously start a Playwright browser with the given spider configuration.
-
-    Args:
-        spider: The spider instance containing credentials and configuration.
-        headless (bool): Whether to start the browser in headless mode.
-        channel (str): Browser channel to use (e.g., "chromium").
-        enable_js (bool): Whether to enable JavaScript in the browser context.
-        wait_for_storage_state (bool): Whether to use spider.playwright_storage if available.
 
-    Returns:
-        (p, browser, context, page): The created Playwright instances
-
-    """
-    p = await async_playwright().start()
-    browser = await p.chromium.launch(
-        headless=headless, channel=channel, args=spider.browser_args
-    )
-
-    context = await browser.new_context(
-        user_agent=spider.user_agent,
-        locale="en-US",
-        storage_state=spider.playwright_storage if wait_for_storage_state else None,
-        java_script_enabled=enable_js,
-        no_viewport=True,
-    )
-    context.set_default_timeout(120000)
-    page = await context.new_page()
-    return p, browser, context, page
-
-
-async def shutdown_playwright(p_inst, browser, context):
-    """
-    Asynchronously close the Playwright browser, context, and page instances.
+    def __init__(self, crawler) -> None:
+        self.limiter = RateLimiter.from_settings(crawler.settings)
+        self.stats = crawler.stats
 
-    Args:
-        p_inst: The Playwright instance.
-        browser: The Playwright browser instance.
-        context: The Playwright context instance.
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool("RATE_LIMIT_ENABLED"):
+            raise NotConfigured
+        middleware = cls(crawler)
+        _rate_limits[crawler] = middleware
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+        return middleware
 
-    """
-    await context.close()
-    await browser.close()
-    await p_inst.stop()
+    @staticmethod
+    def existing(crawler):
+        """Return the middleware of the crawler if it is enabled."""
+        return _rate_limits.get(crawler)
 
+    def spider_closed(self, spider):
+        return deferred_from_coro(self.limiter.close())
 
-async def get_content_with_playwright(request, p, browser, context, page, spider):
-    """
-    Asynchronously navigate to a URL using Playwright and return page content.
+    async def process_request(self, request, spider):
+        await self.wait(request, spider)
 
-    Args:
-        request: The Scrapy request object.
-        p: The Playwright instance.
-        browser: The Playwright browser instance.
-        context: The Playwright context instance.
-        page: The Playwright page instance.
-        spider: The spider instance.
+    async def wait(self, request, spider):
+        """Wait until the domain of the request has a token for it."""
+        domain = urlparse_cached(request).hostname
+        wait = await self.limiter.acquire(domain)
+        backend = "redis" if self.limiter.shared else "memory"
+        self.stats.inc_value(f"ratelimit/{backend}", spider=spider)
+        if wait:
+            self.stats.inc_value("ratelimit/delayed", spider=spider)
+            self.stats.inc_value("ratelimit/wait_time", wait, spider=spider)
+            self.stats.max_value("ratelimit/max_wait_time", wait, spider=spider)
+            await asyncio.sleep(wait)
 
-    Returns:
-        str: The HTML content of the loaded page.
 
+class TooManyRequestsRetryMiddleware(RetryMiddleware):
     """
-    await page.route(
-        "**/*", lambda route: block_images_and_unnecessary_elements(route, spider)
-    )
-    await page.goto(request.url)
-    content = await page.content()
-    await shutdown_playwright(p, browser, context)
-    return content
+    Modifies RetryMiddleware to delay retries on status 429 without blocking.
 
+    A 429 pauses its domain for the Retry-After delay (at most ``MAX_DELAY``
+    seconds, ``DEFAULT_DELAY`` if absent/invalid) and puts the retry in a
+    delay queue with a not-before timestamp. Requests for a paused domain
+    join the delay queue as well, so only that domain waits while other
+    domains and downloaded responses keep flowing. The spider is kept open
+    while the delay queue is not empty.
 
-async def async_sleep(delay, return_value=None):
-    await asyncio.sleep(delay)
-    return return_value
-
-
-class TooManyRequestsRetryMiddleware(RetryMiddleware):
-    """Modifies RetryMiddleware to delay retries on status 429."""
+    Runs before ``PatchrightMiddleware`` so that paused requests never reach
+    the browser.
+    """
 
     DEFAULT_DELAY = 60  # Delay in seconds.
     MAX_DELAY = 600  # Sometimes, RETRY-AFTER has absurd values
 
-    async def process_response(self, request, response, spider):
+    def __init__(self, settings) -> None:
+        super().__init__(settings)
+        self.paused = {}
+        self.delayed = []
+        self._sequence = count()
+        self._release_task = task.LoopingCall(self._release_due)
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        middleware = cls(crawler.settings)
+        middleware.crawler = crawler
+        middleware.stats = crawler.stats
+        crawler.signals.connect(middleware.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(middleware.spider_idle, signal=signals.spider_idle)
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+        return middleware
+
+    def spider_opened(self, spider):
+        self._release_task.start(1, now=False)
+
+    def spider_idle(self, spider):
+        """Keep the spider open until every delayed request was sent."""
+        if self.delayed:
+            raise DontCloseSpider
+
+    def spider_closed(self, spider):
+        if self._release_task.running:
+            self._release_task.stop()
+
+    def process_request(self, request, spider):
+        """Move requests for a paused domain to the delay queue."""
+        domain = urlparse_cached(request).hostname
+        not_before = self.paused.get(domain)
+        if not_before is None or not_before <= time():
+            return None
+        self._delay(request.replace(dont_filter=True), not_before)
+        raise IgnoreRequest(f"{domain} is paused after a 429")
+
+    def process_response(self, request, response, spider):
         """
         Like RetryMiddleware.process_response, but, if response status is 429.
 
-        Retry the request only after waiting at most self.MAX_DELAY seconds.
-        Respect the Retry-After header if it's less than self.MAX_DELAY.
-        If Retry-After is absent/invalid, wait only self.DEFAULT_DELAY seconds.
+        Pause the domain and queue the retry for after the delay, instead of
+        waiting for it in the downloader. Respect the Retry-After header if
+        it's less than self.MAX_DELAY. If Retry-After is absent/invalid, wait
+        only self.DEFAULT_DELAY seconds.
         """
         if request.meta.get("dont_retry", False):
             return response
 
-        if response.status in self.retry_http_codes:
-            if response.status == 429:
-                retry_after = response.headers.get("retry-after")
-                try:
-                    retry_after = int(retry_after)
-                except (ValueError, TypeError):
-                    delay = self.DEFAULT_DELAY
-                else:
-                    delay = min(self.MAX_DELAY, retry_after)
-                spider.logger.info(f"Retrying {request} in {delay} seconds.")
-
-                await async_sleep(delay)
+        if response.status not in self.retry_http_codes:
+            return response
 
-            reason = response_status_message(response.status)
+        reason = response_status_message(response.status)
+        if response.status != 429:
             return self._retry(request, reason, spider) or response
 
-        return response
+        retry_after = response.headers.get("retry-after")
+        try:
+            retry_after = int(retry_after)
+        except (ValueError, TypeError):
+            delay = self.DEFAULT_DELAY
+        else:
+            delay = min(self.MAX_DELAY, retry_after)
+
+        domain = urlparse_cached(request).hostname
+        not_before = max(self.paused.get(domain, 0), time() + delay)
+        self.paused[domain] = not_before
+        self.stats.inc_value(f"retry_429/count/{domain}", spider=spider)
+        self.stats.set_value(f"retry_429/backoff/{domain}", delay, spider=spider)
+
+        retry_request = self._retry(request, reason, spider)
+        if retry_request is None:
+            return response
+        spider.logger.info(f"Retrying {request} in {delay} seconds.")
+        self._delay(retry_request, not_before)
+        raise IgnoreRequest(f"{request} was delayed after a 429")
+
+    def _delay(self, request, not_before):
+        heapq.heappush(self.delayed, (not_before, next(self._sequence), request))
+        self.stats.set_value("retry_429/delayed", len(self.delayed))
+
+    def _release_due(self):
+        """Send the delayed requests that are due and resume paused domains."""
+        now = time()
+        while self.delayed and self.delayed[0][0] <= now:
+            _, _, request = heapq.heappop(self.delayed)
+            self.crawler.engine.crawl(request)
+        self.stats.set_value("retry_429/delayed", len(self.delayed))
+
+        for domain, not_before in list(self.paused.items()):
+            backoff = max(not_before - now, 0)
+            self.stats.set_value(f"retry_429/backoff/{domain}", round(backoff))
+            if not backoff:
+                del self.paused[domain]
 
 
 class PatchrightMiddleware:
-    async def _fetch(self, request, spider):
-        """Fetch content using Playwright with stealth settings."""
-        p = browser = context = None
-        try:
-            p, browser, context, page = await start_playwright(
-                spider,
-                headless=True,
-                channel="chromium",
-                enable_js=True,
-                wait_for_storage_state=False,
+    """
+    Render requests in the shared Patchright browser of the crawler.
+
+    The render mode comes from ``request.meta["render"]`` or the spider's
+    ``render_mode`` attribute:
+
+    - ``"always"`` (default): every request is rendered in the browser.
+    - ``"never"``: the request goes through Scrapy's downloader only.
+    - ``"auto"``: the request is downloaded over plain HTTP first and only
+      rendered when the response is a challenge page or misses
+      ``request.meta["ready_selector"]``.
+    - ``"handoff"``: requests are rendered until a page of their domain
+      passes without a challenge. The browser's cookies and User-Agent for
+      that domain are then handed to plain HTTP requests, until one of them
+      is a challenge page or misses ``request.meta["ready_selector"]``; that
+      request is rendered and the handoff starts over.
+
+    Rendered requests return as soon as they are ready. With
+    ``request.meta["ready_selector"]`` the page is waited for until that
+    selector is attached (and contains ``request.meta["ready_text"]`` if set),
+    for at most ``ready_timeout`` seconds, reloading it in place up to
+    ``ready_reloads`` times. Without it the page is waited for until the
+    network is idle.
+
+    ``request.meta["capture"]`` is a list of regexes; every network response
+    of the page whose URL or content type matches one of them is recorded in
+    ``response.meta["captured"]`` as a dict with its ``url``, ``status``,
+    ``content_type`` and ``text``.
+    With ``request.meta["capture_only"]`` the page itself is not serialized
+    and the response body is empty.
+
+    ``request.meta["extract"]`` extracts data inside the page instead of
+    serializing it: either a JavaScript function whose JSON-serializable
+    result becomes the body of a ``TextResponse`` (read it with
+    ``response.json()``), or a field map of names to selectors. A selector
+    is CSS, optionally ending in ``::text`` or ``::attr(name)`` like in
+    Scrapy, or XPath prefixed with "xpath="; wrap it in a list to get all
+    matches instead of the first one. Extracting requests are always
+    rendered, also in ``"auto"`` mode.
+
+    Rendered pages are cached on disk when ``PATCHRIGHT_CACHE_ENABLED`` is set,
+    see ``RenderCache``. Every phase of a render is timed, see
+    ``RenderTimings``.
+    """
+
+    def __init__(self, crawler) -> None:
+        self.crawler = crawler
+        self.pool = BrowserPool.from_crawler(crawler)
+        self.stats = crawler.stats
+        self.ready_timeout = crawler.settings.getfloat("PATCHRIGHT_READY_TIMEOUT")
+        self.ready_reloads = crawler.settings.getint("PATCHRIGHT_READY_RELOADS")
+        self.cache = RenderCache(crawler)
+        self.timings = RenderTimings(crawler)
+        self.handoffs = {}
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        middleware = cls(crawler)
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+        return middleware
+
+    def spider_closed(self, spider):
+        """Report the render timings and the time saved by skipping the browser."""
+        self.timings.close(spider)
+        render_count = self.stats.get_value("patchright/render/count", 0)
+        http_served = self.stats.get_value("patchright/hybrid/http_served", 0)
+        if render_count + http_served:
+            self.stats.set_value(
+                "patchright/hybrid/http_share",
+                http_served / (render_count + http_served),
+                spider=spider,
             )
+        if not render_count or not http_served:
+            return
+        average_render_time = (
+            self.stats.get_value("patchright/render/time", 0) / render_count
+        )
+        http_time = self.stats.get_value("patchright/hybrid/http_time", 0)
+        self.stats.set_value(
+            "patchright/hybrid/latency_saved",
+            max(http_served * average_render_time - http_time, 0),
+            spider=spider,
+        )
 
-            if request.meta.get("no_wait_until_networkidle"):
-                await page.goto(request.url, wait_until="domcontentloaded")
-            else:
-                await page.goto(request.url, wait_until="networkidle")
-            await asyncio.sleep(request.meta.get("delay", 0))
-            return await page.content()
+    @staticmethod
+    def _render_mode(request, spider):
+        return request.meta.get("render", getattr(spider, "render_mode", "always"))
+
+    async def _fetch(self, request, spider, timings):
+        """Fetch content using Playwright with stealth settings."""
+        patterns = [re.compile(pattern) for pattern in request.meta.get("capture", ())]
+        captured = []
+
+        def capture(response):
+            content_type = response.headers.get("content-type", "")
+            if any(p.search(response.url) or p.search(content_type) for p in patterns):
+                captured.append(asyncio.ensure_future(self._read_captured(response)))
+
+        try:
+            async with self.pool.slot(timings) as slot:
+                page = slot.page
+                await self.pool.block(slot, request.url)
+                if patterns:
+                    page.on("response", capture)
+                try:
+                    with timed(timings, "goto"):
+                        response = await page.goto(
+                            request.url, wait_until="domcontentloaded"
+                        )
+
+                    # Hand 429s to TooManyRequestsRetryMiddleware instead of waiting
+                    if response and response.status == 429:
+                        headers = await response.all_headers()
+                        retry_after = {"Retry-After": headers.get("retry-after", "")}
+                        return await page.content(), 429, retry_after, False
+
+                    ready = await self._wait_for_page(page, request, spider, timings)
+                    if patterns:
+                        with timed(timings, "capture"):
+                            results = await asyncio.gather(*captured)
+                        request.meta["captured"] = [r for r in results if r]
+                        self.stats.inc_value(
+                            "patchright/capture/responses",
+                            len(request.meta["captured"]),
+                            spider=spider,
+                        )
+                    content = await self._serialize(page, request, timings)
+                    await self._share_session(slot, request, spider, timings, content)
+                    status = response.status if response else 200
+                    return content, status, {}, ready
+                finally:
+                    if patterns:
+                        page.remove_listener("response", capture)
+                        for pending in captured:
+                            pending.cancel()
         except _errors.TimeoutError as e:
             spider.logger.error(f"Timeout error {e}, retrying...")
             raise IgnoreRequest from e
-        finally:
-            if all((p, browser, context)):
-                await shutdown_playwright(p, browser, context)
 
-    async def process_request(self, request, spider):
-        content = await self._fetch(request, spider)
-        if not content:
+    async def _wait_for_page(self, page, request, spider, timings):
+        """Wait until the loaded page is ready to be read, return if it became so."""
+        ready = True
+        if request.meta.get("ready_selector"):
+            with timed(timings, "ready"):
+                ready = await self._wait_until_ready(page, request, spider)
+        elif not request.meta.get("no_wait_until_networkidle"):
+            with timed(timings, "networkidle"):
+                await page.wait_for_load_state("networkidle")
+        if delay := request.meta.get("delay", 0):
+            with timed(timings, "delay"):
+                await asyncio.sleep(delay)
+        return ready
+
+    async def _serialize(self, page, request, timings):
+        """Return the response body of a ready page."""
+        if request.meta.get("capture_only"):
+            return ""
+        if extract := request.meta.get("extract"):
+            with timed(timings, "extract"):
+                return json.dumps(await self._extract(page, extract))
+        with timed(timings, "content"):
+            return await page.content()
+
+    @staticmethod
+    async def _extract(page, extract):
+        """Run a JavaScript function or a field map of selectors in the page."""
+        if isinstance(extract, str):
+            return await page.evaluate(extract)
+
+        fields = []
+        for name, spec in extract.items():
+            many = isinstance(spec, list)
+            selector = spec[0] if many else spec
+            suffix = ""
+            if not selector.startswith("xpath="):
+                selector, _, suffix = selector.partition("::")
+            fields.append([name, selector, suffix, many])
+        return await page.evaluate(EXTRACT_FIELDS_SCRIPT, fields)
+
+    async def _share_session(self, slot, request, spider, timings, content):
+        """Pass the session of a page that cleared its challenges on."""
+        save_state = self.pool.states.is_due(request.url)
+        hand_off = self._render_mode(request, spider) == "handoff"
+        if not save_state and not hand_off:
+            return
+
+        with timed(timings, "session"):
+            # The body is only the page's HTML if it was neither extracted nor skipped
+            if request.meta.get("extract") or request.meta.get("capture_only"):
+                content = await slot.page.content()
+            if is_challenge_body(content):
+                return
+            if save_state:
+                await self.pool.states.save(slot.context, request.url)
+            if hand_off:
+                cookies = await slot.context.cookies(request.url)
+                user_agent = await slot.page.evaluate("navigator.userAgent")
+                self.handoffs[urlparse_cached(request).hostname] = (
+                    "; ".join(f"{c["name"]}={c["value"]}" for c in cookies),
+                    user_agent,
+                )
+                self.stats.inc_value("patchright/handoff/exported", spider=spider)
+
+    async def _read_captured(self, response):
+        """Read the body of a captured response."""
+        try:
+            body = await response.body()
+        except _errors.Error:
             return None
+        self.stats.inc_value("patchright/capture/bytes", len(body))
+        return {
+            "url": response.url,
+            "status": response.status,
+            "content_type": response.headers.get("content-type", ""),
+            "text": body.decode("utf-8", errors="replace"),
+        }
+
+    async def _wait_until_ready(self, page, request, spider):
+        """Wait for the ready selector, reloading the page if it never shows up."""
+        selector = request.meta["ready_selector"]
+        text = request.meta.get("ready_text")
+        timeout = request.meta.get("ready_timeout", self.ready_timeout) * 1000
+        reloads = request.meta.get("ready_reloads", self.ready_reloads)
+
+        for attempt in range(reloads + 1):
+            if attempt:
+                self.stats.inc_value("patchright/ready/reloads", spider=spider)
+                await page.reload(wait_until="domcontentloaded")
+            try:
+                if text:
+                    await page.wait_for_function(
+                        READY_TEXT_PREDICATE, arg=[selector, text], timeout=timeout
+                    )
+                else:
+                    await page.wait_for_selector(
+                        selector, state="attached", timeout=timeout
+                    )
+            except _errors.TimeoutError:
+                continue
+            return True
+
+        self.stats.inc_value("patchright/ready/timeouts", spider=spider)
+        spider.logger.warning(f"{request} was not ready after {reloads} reloads")
+        return False
+
+    async def _render(self, request, spider):
+        content = self.cache.retrieve(request)
+        if content:
+            return HtmlResponse(
+                url=request.url,
+                body=content,
+                encoding="utf-8",
+                request=request,
+                flags=["patchright", "cached"],
+            )
 
+        if rate_limit := RateLimitMiddleware.existing(self.crawler):
+            await rate_limit.wait(request, spider)
+        timings = {}
+        status = None
+        started = monotonic()
+        try:
+            content, status, headers, ready = await self._fetch(
+                request, spider, timings
+            )
+        finally:
+            timings["total"] = monotonic() - started
+            self.timings.record(request, spider, timings, status)
+        self.stats.inc_value("patchright/render/count", spider=spider)
+        self.stats.inc_value("patchright/render/time", timings["total"], spider=spider)
+
+        # Never cache challenges or half-loaded pages, some entries never expire
+        if status == 200 and ready and not is_challenge_body(content):
+            self.cache.store(request, content)
+        if request.meta.get("extract") and status == 200:
+            return TextResponse(
+                url=request.url,
+                headers={"Content-Type": "application/json"},
+                body=content,
+                encoding="utf-8",
+                request=request,
+                flags=["patchright", "extracted"],
+            )
         return HtmlResponse(
-            url=request.url, body=content, encoding="utf-8", request=request
+            url=request.url,
+            status=status,
+            headers=headers,
+            body=content,
+            encoding="utf-8",
+            request=request,
+            flags=["patchright"],
         )
 
+    async def process_request(self, request, spider):
+        mode = self._render_mode(request, spider)
+        if mode == "never":
+            return None
+        if request.meta.get("extract"):
+            return await self._render(request, spider)
+        if mode == "auto":
+            request.headers.setdefault("User-Agent", spider.user_agent)
+            return None
+        if mode == "handoff":
+            handoff = self.handoffs.get(urlparse_cached(request).hostname)
+            if handoff:
+                request.headers["Cookie"], request.headers["User-Agent"] = handoff
+                return None
+        return await self._render(request, spider)
+
+    async def process_response(self, request, response, spider):
+        mode = self._render_mode(request, spider)
+        if (
+            mode not in {"auto", "handoff"}
+            or "patchright" in response.flags
+            or response.status == 429
+        ):
+            return response
+
+        ready_selector = request.meta.get("ready_selector")
+        if not is_challenge_page(response) and (
+            not ready_selector or is_selector_present(ready_selector, response)
+        ):
+            self.stats.inc_value("patchright/hybrid/http_served", spider=spider)
+            self.stats.inc_value(
+                "patchright/hybrid/http_time",
+                request.meta.get("download_latency", 0),
+                spider=spider,
+            )
+            return response
+
+        spider.logger.debug(f"Escalating {request} to the browser")
+        self.stats.inc_value("patchright/hybrid/escalated", spider=spider)
+        if mode == "handoff":
+            self.handoffs.pop(urlparse_cached(request).hostname, None)
+        return await self._render(request, spider) or response
+
 
 class FilterCSNewsURLMiddleware:
+    """Drop requests for news articles the spider already knows about."""
+
     async def process_request(self, request, spider):
-        async with new_session() as session:
-            short_url = request.url.split("https://www.hltv.org")[-1]
-            stmt = select(RawNews).filter_by(url=short_url)
-            news = await session.execute(stmt)
-            news = news.scalars().first()
-            if news and news.text:
-                spider.logger.info(
-                    f"URL {request.url} already in the database. Skipping."
-                )
-                raise IgnoreRequest
+        short_url = request.url.split("https://www.hltv.org")[-1]
+        if short_url in spider.known_news_urls:
+            spider.logger.info(f"URL {request.url} already in the database. Skipping.")
+            raise IgnoreRequest
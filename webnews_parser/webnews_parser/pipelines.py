@@ -1,6 +1,13 @@
 """Pipeline classes for processing scraped items."""
 
+from abc import ABC, abstractmethod
+import asyncio
+import hashlib
+import json
 from datetime import datetime
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from time import monotonic, time
 from typing import Any
 
 from flux_orm.database import new_session
@@ -14,17 +21,32 @@ from flux_orm.models.models import (
     TeamMember,
 )
 from flux_orm.models.enums import PipelineStatus
-from sqlalchemy import select
+from sqlalchemy import exists, inspect, literal, select, update
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 import scrapy
-
-from .utils.db_utils import poll_sport_by_name, update_object
+from scrapy.crawler import Crawler
+from scrapy.exceptions import DropItem
+from scrapy.utils.defer import deferred_from_coro
+from scrapy.utils.project import data_path
+
+from .utils.db_utils import (
+    copy_to_staging,
+    get_sport_id,
+    link_rows,
+    link_rows_from_select,
+    primary_key,
+    update_object,
+)
 from flux_orm.models.utils import utcnow_naive
 from flux_orm.models.enums import MatchStatusEnum
 
+# Sent by the storing pipelines with ``item`` and ``spider`` once the item was
+# committed to the database.
+item_stored = object()
+
 
 async def upsert_match(item: dict[str, Any], session: AsyncSession) -> Match:
     """Create or update a match."""
@@ -32,10 +54,10 @@ async def upsert_match(item: dict[str, Any], session: AsyncSession) -> Match:
     match_data = item.copy()
     match_data.pop("match_status", None)
 
-    sport = await poll_sport_by_name("CS2")
+    sport_id = await get_sport_id("CS2")
     stmt = (
         insert(Match)
-        .values(**match_data, sport_id=sport.sport_id)
+        .values(**match_data, sport_id=sport_id)
         .on_conflict_do_update(
             index_elements=["external_id"],
             set_={
@@ -56,6 +78,84 @@ async def upsert_match(item: dict[str, Any], session: AsyncSession) -> Match:
     return result.scalar_one()
 
 
+async def upsert_matches(
+    items: list[dict[str, Any]], session: AsyncSession
+) -> dict[str, Any]:
+    """
+    Create or update matches with a single multi-row upsert.
+
+    Returns:
+        dict: Match ids keyed by external id.
+
+    """
+    sport_id = await get_sport_id("CS2")
+    now = utcnow_naive()
+    # Postgres refuses to update the same row twice in one statement
+    rows = {
+        item["external_id"]: {
+            "external_id": item["external_id"],
+            "match_name": item.get("match_name"),
+            "match_url": item.get("match_url"),
+            "planned_start_datetime": item.get("planned_start_datetime"),
+            "sport_id": sport_id,
+            "pipeline_status": PipelineStatus.NEW,
+            "pipeline_update_time": now,
+        }
+        for item in items
+    }
+    stmt = insert(Match).values(list(rows.values()))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["external_id"],
+        set_={
+            "match_name": stmt.excluded.match_name,
+            "planned_start_datetime": stmt.excluded.planned_start_datetime,
+            "pipeline_status": stmt.excluded.pipeline_status,
+            "pipeline_update_time": stmt.excluded.pipeline_update_time,
+        },
+    ).returning(Match.match_id, Match.external_id)
+    result = await session.execute(stmt)
+    return {external_id: match_id for match_id, external_id in result}
+
+
+async def upsert_match_statuses(
+    session: AsyncSession, statuses: dict[Any, dict[str, Any]]
+) -> None:
+    """
+    Create or update the statuses of many matches with set-based statements.
+
+    Args:
+        session: The session to execute the statements in.
+        statuses: MatchStatus column values keyed by match id.
+
+    """
+    if not statuses:
+        return
+
+    match_fk = Match.match_status.property.local_remote_pairs[0][1]
+    status_pk = inspect(MatchStatus).primary_key[0]
+    status_pk_name = inspect(MatchStatus).get_property_by_column(status_pk).key
+    result = await session.execute(
+        select(match_fk, status_pk).where(match_fk.in_(statuses))
+    )
+    existing = dict(result.tuples().all())
+
+    if existing:
+        await session.execute(
+            update(MatchStatus),
+            [
+                {status_pk_name: status_id, **statuses[match_id]}
+                for match_id, status_id in existing.items()
+            ],
+        )
+    new_statuses = [
+        {match_fk.key: match_id, **values}
+        for match_id, values in statuses.items()
+        if match_id not in existing
+    ]
+    if new_statuses:
+        await session.execute(insert(MatchStatus).values(new_statuses))
+
+
 async def get_or_create_team(
     session: AsyncSession,
     team_data: dict[str, Any],
@@ -81,60 +181,576 @@ async def get_or_create_team(
     return team
 
 
-class CSCreateLiveScheduledMatchesPipeline:
-    """Pipeline for creating new matches with empty tournament placeholders."""
+async def get_or_create_team_ids(
+    session: AsyncSession, teams: dict[str, tuple[str, str]]
+) -> dict[str, Any]:
+    """
+    Resolve teams by name, inserting the missing ones in a single statement.
+
+    Args:
+        session: The session to execute the statements in.
+        teams: ``(pretty_name, team_url)`` pairs keyed by team name.
+
+    Returns:
+        dict: Team ids keyed by team name.
+
+    """
+    if not teams:
+        return {}
+
+    team_pk = inspect(Team).primary_key[0]
+    result = await session.execute(
+        select(Team.name, team_pk).where(Team.name.in_(teams))
+    )
+    team_ids = dict(result.tuples().all())
+
+    new_teams = [
+        {"name": name, "pretty_name": pretty_name, "team_url": team_url}
+        for name, (pretty_name, team_url) in teams.items()
+        if name not in team_ids
+    ]
+    if new_teams:
+        result = await session.execute(
+            insert(Team).values(new_teams).returning(Team.name, team_pk)
+        )
+        team_ids.update(result.tuples().all())
+    return team_ids
+
+
+class SkipUnchangedPipeline:
+    """
+    Drop items that did not change since they were last stored.
+
+    The spider names the item field identifying the entity in
+    ``content_hash_key``. A hash of the whole item is compared with the one
+    recorded for that entity, and unchanged items are dropped before any
+    database pipeline opens a session. Hashes are recorded once the storing
+    pipeline sends ``item_stored`` after its commit, so an item whose write
+    failed is written again the next time it is scraped. They are kept per
+    spider in ``CONTENT_HASH_DIR`` between runs and ignored after
+    ``CONTENT_HASH_TTL`` seconds.
+    """
+
+    def __init__(self, crawler: Crawler) -> None:
+        """Read the hash store configuration from the crawler settings."""
+        self.stats = crawler.stats
+        self.ttl = crawler.settings.getint("CONTENT_HASH_TTL")
+        self.hash_dir = Path(
+            data_path(crawler.settings["CONTENT_HASH_DIR"], createdir=True)
+        )
+        self.hashes: dict[str, tuple[str, float]] = {}
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "SkipUnchangedPipeline":
+        """Create the pipeline and record hashes of stored items."""
+        pipeline = cls(crawler)
+        crawler.signals.connect(pipeline.item_stored, signal=item_stored)
+        return pipeline
+
+    def open_spider(self, spider: scrapy.Spider) -> None:
+        """Load the hashes recorded by previous runs of the spider."""
+        try:
+            data = json.loads(self._path(spider).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        self.hashes = {key: tuple(entry) for key, entry in data.items()}
+
+    def close_spider(self, spider: scrapy.Spider) -> None:
+        """Persist the hashes for the next run, dropping expired ones."""
+        now = time()
+        hashes = {
+            key: entry
+            for key, entry in self.hashes.items()
+            if now - entry[1] <= self.ttl
+        }
+        path = self._path(spider)
+        with NamedTemporaryFile(
+            "w", encoding="utf-8", dir=path.parent, delete=False
+        ) as tmp:
+            json.dump(hashes, tmp)
+        Path(tmp.name).replace(path)
+
+    def process_item(
+        self, item: dict[str, Any], spider: scrapy.Spider
+    ) -> dict[str, Any]:
+        """
+        Drop the item if its content hash did not change.
+
+        Args:
+            item: The scraped data.
+            spider: The spider instance.
+
+        Returns:
+            dict: The item, if it changed.
+
+        Raises:
+            DropItem: If the item did not change.
+
+        """
+        key, digest = self._hash(item, spider)
+        recorded = self.hashes.get(key)
+        if recorded and recorded[0] == digest and time() - recorded[1] <= self.ttl:
+            self.stats.inc_value("content_hash/unchanged")
+            raise DropItem(f"Unchanged since the last run: {key}", log_level="DEBUG")
+        self.stats.inc_value("content_hash/changed")
+        return item
+
+    def item_stored(self, item: dict[str, Any], spider: scrapy.Spider) -> None:
+        """Record the hash of an item that was committed to the database."""
+        key, digest = self._hash(item, spider)
+        self.hashes[key] = (digest, time())
+
+    @staticmethod
+    def _hash(item: dict[str, Any], spider: scrapy.Spider) -> tuple[str, str]:
+        data = dict(item)
+        content = json.dumps(data, sort_keys=True, default=str).encode("utf-8")
+        key = str(data[spider.content_hash_key])
+        return key, hashlib.sha1(content, usedforsecurity=False).hexdigest()
+
+    def _path(self, spider: scrapy.Spider) -> Path:
+        return self.hash_dir / f"{spider.name}.json"
+
+
+class WriteBehindPipeline(ABC):
+    """
+    Base pipeline that can store items without holding up the engine.
+
+    With ``PIPELINE_WRITE_BEHIND`` enabled, ``process_item`` puts the item in a
+    queue of at most ``PIPELINE_WRITE_BEHIND_QUEUE_SIZE`` items and releases it
+    right away, while ``PIPELINE_WRITE_BEHIND_WORKERS`` writer tasks store the
+    queued items. The engine only waits when the queue is full, and the queue
+    is drained before the spider closes. Without it every item is stored
+    before it is released. Subclasses implement ``store_item`` and call
+    ``notify_stored`` for every item they committed.
+    """
+
+    def __init__(self, crawler: Crawler) -> None:
+        """Read the write-behind configuration from the crawler settings."""
+        settings = crawler.settings
+        self.stats = crawler.stats
+        self.signals = crawler.signals
+        self.write_behind = settings.getbool("PIPELINE_WRITE_BEHIND")
+        self.queue_size = settings.getint("PIPELINE_WRITE_BEHIND_QUEUE_SIZE")
+        self.workers = settings.getint("PIPELINE_WRITE_BEHIND_WORKERS")
+        self._queue: asyncio.Queue | None = None
+        self._writers: list[asyncio.Task] = []
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "WriteBehindPipeline":
+        """Create the pipeline with the settings of the crawler."""
+        return cls(crawler)
+
+    def open_spider(self, spider: scrapy.Spider) -> None:
+        """Start the writer tasks if write-behind is enabled."""
+        if not self.write_behind:
+            return
+        self._queue = asyncio.Queue(self.queue_size)
+        self._writers = [
+            asyncio.ensure_future(self._write_behind(spider))
+            for _ in range(self.workers)
+        ]
+
+    def close_spider(self, spider: scrapy.Spider):
+        """Store the remaining items before the spider closes."""
+        return deferred_from_coro(self._close(spider))
+
+    async def _close(self, spider: scrapy.Spider) -> None:  # noqa: ARG002
+        if self._queue is None:
+            return
+        await self._queue.join()
+        for writer in self._writers:
+            writer.cancel()
+        await asyncio.gather(*self._writers, return_exceptions=True)
+        self._writers = []
 
     async def process_item(
         self, item: dict[str, Any], spider: scrapy.Spider
     ) -> dict[str, Any]:
         """
-        Process match items and create new database entries.
+        Store the item, or queue it for the writer tasks.
 
         Args:
-            item: The scraped match data.
+            item: The scraped data.
             spider: The spider instance.
 
         Returns:
             dict: The processed item.
 
         """
-        async with new_session(expire_on_commit=True, autoflush=False) as session:
-            match = await upsert_match(item, session)
+        if self._queue is None:
+            await self.store_item(item, spider)
+            return item
+
+        started = monotonic()
+        await self._queue.put((started, item))
+        depth = self._queue.qsize()
+        self.stats.inc_value("pipeline/write_behind/put_wait", monotonic() - started)
+        self.stats.max_value("pipeline/write_behind/max_queue_depth", depth)
+        return item
 
-            if not match.match_status:
-                match_status = MatchStatus()
-                match_status.name = MatchStatusEnum(item["match_status"])
-                match.match_status = match_status
+    async def _write_behind(self, spider: scrapy.Spider) -> None:
+        while True:
+            enqueued, item = await self._queue.get()
+            started = monotonic()
+            # The queue is FIFO, so the dequeued item is the oldest one
+            age = started - enqueued
+            self.stats.set_value("pipeline/write_behind/oldest_item_age", age)
+            self.stats.max_value("pipeline/write_behind/max_item_age", age)
+            try:
+                await self.store_item(item, spider)
+            except Exception as e:  # noqa: BLE001
+                spider.logger.error(f"Error: {e}")
+                self.stats.inc_value("pipeline/write_behind/failed_items")
             else:
-                match.match_status.name = MatchStatusEnum(item["match_status"])
-            match.pipeline_status = PipelineStatus.NEW
-            match.pipeline_update_time = utcnow_naive()
+                self.stats.inc_value("pipeline/write_behind/items")
+            finally:
+                latency = monotonic() - started
+                self.stats.inc_value("pipeline/write_behind/writer_latency", latency)
+                self.stats.max_value(
+                    "pipeline/write_behind/max_writer_latency", latency
+                )
+                self.stats.set_value(
+                    "pipeline/write_behind/queue_depth", self._queue.qsize()
+                )
+                self._queue.task_done()
+
+    @abstractmethod
+    async def store_item(self, item: dict[str, Any], spider: scrapy.Spider) -> None:
+        """Write a single item to the database."""
+
+    def notify_stored(self, item: dict[str, Any], spider: scrapy.Spider) -> None:
+        """Send ``item_stored`` for an item that was committed."""
+        self.signals.send_catch_log(signal=item_stored, item=item, spider=spider)
+
+
+class BatchingPipeline(WriteBehindPipeline):
+    """
+    Base pipeline that writes items to the database in batches.
+
+    Items are buffered and written in a single transaction every
+    ``PIPELINE_BATCH_SIZE`` items, every ``PIPELINE_BATCH_INTERVAL`` seconds
+    and when the spider closes. Each item is written in its own savepoint, so
+    a failing item is rolled back and logged without losing the rest of the
+    batch. A batch whose session fails before anything was committed stays
+    buffered for the next flush. Subclasses implement ``write_item``.
+
+    Spiders started with ``-a bulk_load=1`` write batches of
+    ``PIPELINE_BULK_LOAD_BATCH_SIZE`` items with ``load_batch`` instead, which
+    subclasses can override with a ``COPY`` based loader for backfills. A
+    batch that fails to load is rolled back and written with ``write_batch``.
+    """
+
+    def __init__(self, crawler: Crawler) -> None:
+        """Initialize an empty buffer."""
+        super().__init__(crawler)
+        self.batch_size = crawler.settings.getint("PIPELINE_BATCH_SIZE")
+        self.batch_interval = crawler.settings.getfloat("PIPELINE_BATCH_INTERVAL")
+        self.bulk_load_batch_size = crawler.settings.getint(
+            "PIPELINE_BULK_LOAD_BATCH_SIZE"
+        )
+        self.bulk_load = False
+        self._buffer: list[dict[str, Any]] = []
+        self._flush_lock = asyncio.Lock()
+        self._closing = asyncio.Event()
+        self._flush_task: asyncio.Task | None = None
+
+    def open_spider(self, spider: scrapy.Spider) -> None:
+        """Start flushing the buffer periodically."""
+        super().open_spider(spider)
+        self.bulk_load = str(getattr(spider, "bulk_load", "")).lower() in {
+            "1",
+            "true",
+            "yes",
+        }
+        if self.bulk_load:
+            self.batch_size = self.bulk_load_batch_size
+        self._flush_task = asyncio.ensure_future(self._flush_periodically(spider))
+
+    async def _close(self, spider: scrapy.Spider) -> None:
+        await super()._close(spider)
+        self._closing.set()
+        if self._flush_task:
+            try:
+                await self._flush_task
+            except Exception as e:  # noqa: BLE001
+                spider.logger.error(f"Periodic flush stopped: {e}")
+        await self.flush(spider)
+
+    async def _flush_periodically(self, spider: scrapy.Spider) -> None:
+        while not self._closing.is_set():
+            try:
+                await asyncio.wait_for(self._closing.wait(), self.batch_interval)
+            except TimeoutError:
+                try:
+                    await self.flush(spider)
+                except Exception as e:  # noqa: BLE001
+                    spider.logger.error(f"Periodic flush failed: {e}")
+                    self.stats.inc_value("pipeline/batch/failed_flushes")
+
+    async def store_item(self, item: dict[str, Any], spider: scrapy.Spider) -> None:
+        """Buffer the item and flush the buffer once it is full."""
+        self._buffer.append(item)
+        if len(self._buffer) >= self.batch_size:
+            await self.flush(spider)
+
+    async def flush(self, spider: scrapy.Spider) -> None:
+        """Write all buffered items in one transaction."""
+        async with self._flush_lock:
+            items, self._buffer = self._buffer, []
+            if not items:
+                return
+
+            started = monotonic()
             try:
+                written = await self._write(items, spider)
+            except Exception:
+                # Nothing was committed, keep the items for the next flush
+                self._buffer[:0] = items
+                raise
+
+            flush_time = monotonic() - started
+            self.stats.inc_value("pipeline/batch/flushes")
+            self.stats.inc_value("pipeline/batch/items", len(written))
+            self.stats.inc_value(
+                "pipeline/batch/failed_items", len(items) - len(written)
+            )
+            self.stats.inc_value("pipeline/batch/flush_time", flush_time)
+            self.stats.max_value("pipeline/batch/max_flush_time", flush_time)
+            self.stats.max_value("pipeline/batch/max_flush_size", len(items))
+            if self.bulk_load:
+                self._count_bulk_load(len(written), flush_time)
+            for item in written:
+                self.notify_stored(item, spider)
+            if written:
+                self.on_commit(written, spider)
+
+    async def _write(
+        self, items: list[dict[str, Any]], spider: scrapy.Spider
+    ) -> list[dict[str, Any]]:
+        async with new_session() as session:
+            if self.bulk_load:
+                try:
+                    written = await self.load_batch(items, session, spider)
+                    await session.commit()
+                except Exception as e:  # noqa: BLE001
+                    spider.logger.warning(
+                        f"Bulk load failed, writing items one by one: {e}"
+                    )
+                    await session.rollback()
+                    self.stats.inc_value("pipeline/bulk_load/fallbacks")
+                else:
+                    return written
+            try:
+                written = await self.write_batch(items, session, spider)
                 await session.commit()
-            except IntegrityError as e:
-                spider.logger.error(f"IntegrityError: {e}")
-                await session.rollback()
-            except Exception as e:
+            except Exception as e:  # noqa: BLE001
                 spider.logger.error(f"Error: {e}")
                 await session.rollback()
-        return item
+                return []
+            return written
+
+    def _count_bulk_load(self, rows: int, load_time: float) -> None:
+        self.stats.inc_value("pipeline/bulk_load/rows", rows)
+        self.stats.inc_value("pipeline/bulk_load/time", load_time)
+        total_time = self.stats.get_value("pipeline/bulk_load/time")
+        if total_time:
+            self.stats.set_value(
+                "pipeline/bulk_load/rows_per_second",
+                self.stats.get_value("pipeline/bulk_load/rows") / total_time,
+            )
 
+    async def load_batch(
+        self,
+        items: list[dict[str, Any]],
+        session: AsyncSession,
+        spider: scrapy.Spider,
+    ) -> list[dict[str, Any]]:
+        """
+        Write the items of a batch in bulk load mode.
 
-class CSUpdateLiveScheduledMatchesPipeline:
-    """Pipeline for updating match information and status."""
+        Pipelines without a dedicated loader write the batch as usual.
 
-    async def process_item(
-        self, item: dict[str, Any], spider: scrapy.Spider
-    ) -> dict[str, Any]:
+        Returns:
+            list: The items that were written successfully.
+
+        """
+        return await self.write_batch(items, session, spider)
+
+    async def write_batch(
+        self,
+        items: list[dict[str, Any]],
+        session: AsyncSession,
+        spider: scrapy.Spider,
+    ) -> list[dict[str, Any]]:
+        """
+        Write the items of a batch, each one in its own savepoint.
+
+        Subclasses can override this with set-based statements and fall back
+        to this implementation when those fail.
+
+        Returns:
+            list: The items that were written successfully.
+
+        """
+        written = []
+        for item in items:
+            try:
+                async with session.begin_nested():
+                    await self.write_item(item, session, spider)
+            except Exception as e:  # noqa: BLE001
+                spider.logger.error(f"Error: {e}")
+            else:
+                written.append(item)
+        return written
+
+    @abstractmethod
+    async def write_item(
+        self, item: dict[str, Any], session: AsyncSession, spider: scrapy.Spider
+    ) -> None:
+        """Add a single item to the session of the current batch."""
+
+    def on_commit(self, items: list[dict[str, Any]], spider: scrapy.Spider) -> None:
+        """Run after the items of a batch have been committed."""
+
+
+class CSCreateLiveScheduledMatchesPipeline(BatchingPipeline):
+    """Pipeline for creating new matches with empty tournament placeholders."""
+
+    async def write_batch(
+        self,
+        items: list[dict[str, Any]],
+        session: AsyncSession,
+        spider: scrapy.Spider,
+    ) -> list[dict[str, Any]]:
+        """
+        Upsert all matches of the batch and their statuses at once.
+
+        Falls back to writing the items one by one if the batch fails.
+        """
+        try:
+            async with session.begin_nested():
+                match_ids = await upsert_matches(items, session)
+                await upsert_match_statuses(
+                    session,
+                    {
+                        match_ids[item["external_id"]]: {
+                            "name": MatchStatusEnum(item["match_status"])
+                        }
+                        for item in items
+                    },
+                )
+        except Exception as e:  # noqa: BLE001
+            spider.logger.warning(f"Batch upsert failed, writing items one by one: {e}")
+            return await super().write_batch(items, session, spider)
+        return items
+
+    async def write_item(
+        self, item: dict[str, Any], session: AsyncSession, spider: scrapy.Spider
+    ) -> None:
+        """
+        Create or update the match and its status.
+
+        Args:
+            item: The scraped match data.
+            session: The session of the current batch.
+            spider: The spider instance.
+
+        """
+        match = await upsert_match(item, session)
+
+        if not match.match_status:
+            match_status = MatchStatus()
+            match_status.name = MatchStatusEnum(item["match_status"])
+            match.match_status = match_status
+        else:
+            match.match_status.name = MatchStatusEnum(item["match_status"])
+        match.pipeline_status = PipelineStatus.NEW
+        match.pipeline_update_time = utcnow_naive()
+
+
+class CSUpdateLiveScheduledMatchesPipeline(WriteBehindPipeline):
+    """
+    Pipeline for updating match information and status.
+
+    With ``PIPELINE_FAST_PATH`` enabled the match is updated with plain
+    parameterized statements instead of being loaded into the session.
+    """
+
+    def __init__(self, crawler: Crawler) -> None:
+        """Read whether the fast path is enabled."""
+        super().__init__(crawler)
+        self.fast_path = crawler.settings.getbool("PIPELINE_FAST_PATH")
+
+    async def store_item(self, item: dict[str, Any], spider: scrapy.Spider) -> None:
         """Update match details and status."""
+        if self.fast_path:
+            stored = await self._store_item_fast(item, spider)
+        else:
+            stored = await self._store_item_orm(item, spider)
+        if stored:
+            self.notify_stored(item, spider)
+
+    @staticmethod
+    async def _store_item_fast(item: dict[str, Any], spider: scrapy.Spider) -> bool:
+        """Update the match, its teams and its status without the ORM."""
+        match_id = item["match_id"]
+        teams = {
+            item.get(f"team{number}_name"): (
+                item.get(f"pretty_team{number}_name"),
+                item.get(f"team{number}_url"),
+            )
+            for number in (1, 2)
+            if item.get(f"pretty_team{number}_name") not in {None, "", "TBD"}
+        }
+        async with new_session() as session:
+            try:
+                await session.execute(
+                    update(Match)
+                    .where(Match.match_id == match_id)
+                    .values(
+                        pretty_match_name=item.get("pretty_match_name"),
+                        tournament_url=item.get("tournament_url"),
+                        match_streams=item.get("match_streams"),
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                team_ids = await get_or_create_team_ids(session, teams)
+                await link_rows(
+                    session,
+                    Match.match_teams,
+                    [(match_id, team_id) for team_id in team_ids.values()],
+                )
+                await upsert_match_statuses(
+                    session,
+                    {
+                        match_id: {
+                            "name": MatchStatusEnum(item["match_status"]),
+                            "status": {
+                                "team1_score": item["team1_score"],
+                                "team2_score": item["team2_score"],
+                                "match_format": item["match_format"],
+                            },
+                        }
+                    },
+                )
+                await session.commit()
+            except Exception as e:  # noqa: BLE001
+                spider.logger.error(f"Error: {e}")
+                await session.rollback()
+                return False
+            return True
+
+    @staticmethod
+    async def _store_item_orm(item: dict[str, Any], spider: scrapy.Spider) -> bool:
+        """Update the match through the unit of work."""
         async with new_session(expire_on_commit=True, autoflush=False) as session:
             stmt = (
                 select(Match)
-                .options(joinedload(Match.match_status), joinedload(Match.match_teams))
+                .options(joinedload(Match.match_status))
                 .filter_by(match_id=item["match_id"])
             )
             result = await session.execute(stmt)
-            match = result.unique().scalar_one()
+            match = result.scalar_one()
 
             # Update match data
             update_object(
@@ -146,6 +762,7 @@ class CSUpdateLiveScheduledMatchesPipeline:
                 },
             )
 
+            teams = []
             item_team_1 = item.get("pretty_team1_name")
             item_team_2 = item.get("pretty_team2_name")
             if item_team_1 and item_team_1 != "TBD":
@@ -156,8 +773,7 @@ class CSUpdateLiveScheduledMatchesPipeline:
                     item_team_1,
                     item.get("team1_url"),
                 )
-                if team1 not in match.match_teams:
-                    match.match_teams.append(team1)
+                teams.append(team1)
 
             if item_team_2 and item_team_2 != "TBD":
                 team2 = await get_or_create_team(
@@ -167,8 +783,7 @@ class CSUpdateLiveScheduledMatchesPipeline:
                     item_team_2,
                     item.get("team2_url"),
                 )
-                if team2 not in match.match_teams:
-                    match.match_teams.append(team2)
+                teams.append(team2)
 
             # Update match status
             match_status_data = {
@@ -188,6 +803,13 @@ class CSUpdateLiveScheduledMatchesPipeline:
                 update_object(match.match_status, match_status_data)
 
             try:
+                # Link the teams without loading the match's team collection
+                await session.flush()
+                await link_rows(
+                    session,
+                    Match.match_teams,
+                    [(item["match_id"], primary_key(team)) for team in teams],
+                )
                 await session.commit()
             except IntegrityError as e:
                 spider.logger.error(f"IntegrityError: {e}")
@@ -195,123 +817,184 @@ class CSUpdateLiveScheduledMatchesPipeline:
             except Exception as e:
                 spider.logger.error(f"Error: {e}")
                 await session.rollback()
-        return item
+            else:
+                return True
+            return False
 
 
-class CSUpdateTournamentsPipeline:
+class CSUpdateTournamentsPipeline(WriteBehindPipeline):
     """Pipeline for updating tournament information for existing matches."""
 
-    async def process_item(
-        self, item: dict[str, Any], spider: scrapy.Spider
-    ) -> dict[str, Any]:
+    def open_spider(self, spider: scrapy.Spider) -> None:
+        """Start a fresh competition name to id map for the crawl."""
+        super().open_spider(spider)
+        self.competition_ids: dict[str, Any] = {}
+
+    async def store_item(self, item: dict[str, Any], spider: scrapy.Spider) -> None:
         """
-        Update tournament information for a match.
+        Attach the tournament to every match waiting for it.
+
+        The competition, the matches and the links between their teams and
+        the competition are written in a single transaction.
 
         Args:
             item: The scraped tournament data.
             spider: The spider instance.
 
-        Returns:
-            dict: The processed item.
-
         """
+        match_ids = item.get("match_ids")
         async with new_session() as session:
-            sport = await poll_sport_by_name("CS2")
-            stmt = (
-                select(Match)
-                .options(joinedload(Match.match_teams).joinedload(Team.competitions))
-                .filter_by(match_id=item.get("match_id"))
+            competition_id = await self._get_competition_id(item, session)
+
+            competition_fk = Match.competition.property.local_remote_pairs[0][0]
+            await session.execute(
+                update(Match)
+                .where(Match.match_id.in_(match_ids))
+                .values({competition_fk: competition_id})
+                .execution_options(synchronize_session=False)
             )
-            result = await session.execute(stmt)
-            match = result.unique().scalar_one()
-            if match.competition:
-                update_object(
-                    match.competition,
-                    {
-                        "name": item.get("tournament_name"),
-                        "description": item.get("tournament_description"),
-                        "prize_pool": item.get("tournament_prize_pool"),
-                        "location": item.get("tournament_location"),
-                        "start_date": item.get("tournament_start_date"),
-                        "image_url": item.get("tournament_logo_link"),
-                    },
-                )
-            else:
-                select_stmt = select(Competition).filter_by(
-                    name=item.get("tournament_name")
-                )
-                result = await session.execute(select_stmt)
-                competition = result.scalar_one_or_none()
-                if not competition:
-                    competition = Competition()
-                update_object(
-                    competition,
-                    {
-                        "name": item.get("tournament_name"),
-                        "description": item.get("tournament_description"),
-                        "prize_pool": item.get("tournament_prize_pool"),
-                        "location": item.get("tournament_location"),
-                        "start_date": item.get("tournament_start_date"),
-                        "image_url": item.get("tournament_logo_link"),
-                    },
-                )
-                match.competition = competition
-                competition.sport = sport
 
-            for team in match.match_teams:
-                if competition not in team.competitions:
-                    team.competitions.append(competition)
+            match_teams = Match.match_teams.property
+            await link_rows_from_select(
+                session,
+                Team.competitions,
+                select(
+                    match_teams.secondary_synchronize_pairs[0][1],
+                    literal(competition_id),
+                ).where(match_teams.synchronize_pairs[0][1].in_(match_ids)),
+            )
 
             await session.commit()
-        return item
+        self.competition_ids[item.get("tournament_name")] = competition_id
+
+    async def _get_competition_id(
+        self, item: dict[str, Any], session: AsyncSession
+    ) -> Any:
+        """Resolve the competition by name, storing it on its first use."""
+        name = item.get("tournament_name")
+        if name in self.competition_ids:
+            return self.competition_ids[name]
+
+        competition_data = {
+            "name": name,
+            "description": item.get("tournament_description"),
+            "prize_pool": item.get("tournament_prize_pool"),
+            "location": item.get("tournament_location"),
+            "start_date": item.get("tournament_start_date"),
+            "image_url": item.get("tournament_logo_link"),
+            "sport_id": await get_sport_id("CS2"),
+        }
+        competition_pk = inspect(Competition).primary_key[0]
+        competition_id = await session.scalar(
+            select(competition_pk).filter_by(name=name)
+        )
+        if competition_id is None:
+            return await session.scalar(
+                insert(Competition).values(competition_data).returning(competition_pk)
+            )
+
+        await session.execute(
+            update(Competition)
+            .where(competition_pk == competition_id)
+            .values(competition_data)
+            .execution_options(synchronize_session=False)
+        )
+        return competition_id
 
 
-class CSNewsPostgresPipeline:
+class CSNewsPostgresPipeline(BatchingPipeline):
     """Pipeline for processing and storing news articles."""
 
-    async def process_item(
-        self, item: dict[str, Any], spider: scrapy.Spider
-    ) -> dict[str, Any]:
+    async def write_item(
+        self, item: dict[str, Any], session: AsyncSession, spider: scrapy.Spider
+    ) -> None:
         """
-        Store news articles in the database.
+        Store a news article.
 
         Args:
             item: The scraped news data.
+            session: The session of the current batch.
             spider: The spider instance.
 
+        """
+        sport_id = await get_sport_id("CS2")
+        news = RawNews(
+            url=item.get("url"),
+            header=item.get("header"),
+            text=item.get("text"),
+            news_creation_time=item.get("news_creation_time"),
+            sport_id=sport_id,
+            pipeline_status=PipelineStatus.NEW,
+            pipeline_update_time=utcnow_naive(),
+        )
+        session.add(news)
+
+    async def load_batch(
+        self,
+        items: list[dict[str, Any]],
+        session: AsyncSession,
+        spider: scrapy.Spider,
+    ) -> list[dict[str, Any]]:
+        """
+        COPY the articles into a staging table and insert the new ones.
+
         Returns:
-            dict: The processed item.
+            list: The items of the batch.
 
         """
-        async with new_session() as session:
-            sport = await poll_sport_by_name("CS2")
-            news = RawNews(
-                url=item.get("url"),
-                header=item.get("header"),
-                text=item.get("text"),
-                news_creation_time=item.get("news_creation_time"),
-                sport_id=sport.sport_id,
-                pipeline_status=PipelineStatus.NEW,
-                pipeline_update_time=utcnow_naive(),
+        stage = await copy_to_staging(
+            session,
+            "raw_news_stage",
+            select(
+                RawNews.url, RawNews.header, RawNews.text, RawNews.news_creation_time
+            ),
+            [
+                (
+                    item.get("url"),
+                    item.get("header"),
+                    item.get("text"),
+                    item.get("news_creation_time"),
+                )
+                for item in items
+            ],
+        )
+        sport_id = await get_sport_id("CS2")
+        news = select(
+            stage.c.url,
+            stage.c.header,
+            stage.c.text,
+            stage.c.news_creation_time,
+            literal(sport_id),
+            literal(PipelineStatus.NEW, RawNews.pipeline_status.type),
+            literal(utcnow_naive()),
+        ).distinct(stage.c.url)
+        await session.execute(
+            insert(RawNews)
+            .from_select(
+                [
+                    "url",
+                    "header",
+                    "text",
+                    "news_creation_time",
+                    "sport_id",
+                    "pipeline_status",
+                    "pipeline_update_time",
+                ],
+                news,
             )
-            session.add(news)
-            try:
-                await session.commit()
-            except IntegrityError as e:
-                spider.logger.error(f"IntegrityError: {e}")
-                await session.rollback()
-            except Exception as e:
-                spider.logger.error(f"Error: {e}")
-                await session.rollback()
-        return item
+            .on_conflict_do_nothing()
+        )
+        return items
+
+    def on_commit(self, items: list[dict[str, Any]], spider: scrapy.Spider) -> None:
+        """Remember the stored URLs, so the spider does not fetch them again."""
+        spider.known_news_urls.update(item.get("url") for item in items)
 
 
-class CSTeamsPostgresPipeline:
+class CSTeamsPostgresPipeline(WriteBehindPipeline):
     """Pipeline for processing and storing team information."""
 
-    async def process_item(
-        self, item: dict[str, Any], spider: scrapy.Spider
-    ) -> dict[str, Any]:
+    async def store_item(self, item: dict[str, Any], spider: scrapy.Spider) -> None:
         """
         Store team information in the database.
 
@@ -319,22 +1002,15 @@ class CSTeamsPostgresPipeline:
             item: The scraped team data.
             spider: The spider instance.
 
-        Returns:
-            dict: The processed item.
         """
         await self._commit_team_data(item)
-        return item
 
     @staticmethod
     async def _commit_team_data(item: dict[str, Any]) -> None:
         """Store or update team data."""
         async with new_session(expire_on_commit=True, autoflush=False) as session:
             team_page_link = item.get("team_page_link")
-            team = await session.scalar(
-                select(Team)
-                .options(joinedload(Team.members))
-                .filter_by(team_url=team_page_link)
-            )
+            team = await session.scalar(select(Team).filter_by(team_url=team_page_link))
             if not team:
                 team = Team()
                 update_object(
@@ -360,6 +1036,7 @@ class CSTeamsPostgresPipeline:
                     },
                 )
 
+            await session.flush()
             await CSTeamsPostgresPipeline._update_team_members(team, item, session)
             await session.commit()
 
@@ -367,40 +1044,81 @@ class CSTeamsPostgresPipeline:
     async def _update_team_members(
         team: Team, item: dict[str, Any], session: AsyncSession
     ) -> None:
-        """Update team members information."""
-        players_data = item.get("players", {})
+        """
+        Sync the team roster with a constant number of statements.
 
-        for nickname, player_data in players_data.items():
-            team_member_url = item.get("players").get(nickname)[1]
-            member = await session.scalar(
-                select(TeamMember).filter_by(team_member_url=team_member_url)
+        Existing members are loaded with one ``IN`` query and updated in one
+        bulk statement, missing members are inserted in one statement and all
+        of them are linked to the team with conflicts ignored.
+        """
+        players_data = {
+            player_data[1]: (nickname, player_data)
+            for nickname, player_data in item.get("players", {}).items()
+        }
+        if not players_data:
+            return
+
+        member_pk = inspect(TeamMember).primary_key[0]
+        member_pk_name = inspect(TeamMember).get_property_by_column(member_pk).key
+        result = await session.execute(
+            select(member_pk, TeamMember.team_member_url, TeamMember.stats).where(
+                TeamMember.team_member_url.in_(players_data)
             )
+        )
+        existing = {url: (member_id, stats) for member_id, url, stats in result}
 
-            if not member:
-                member = TeamMember()
-                update_object(
-                    member,
+        if existing:
+            await session.execute(
+                update(TeamMember),
+                [
                     {
-                        "nickname": nickname,
-                        "country": player_data[2],  # Index 2 contains country
-                        "stats": {"status": player_data[0]},  # Index 0 contains status
-                        "image_url": player_data[3],  # Index 3 contains image URL
-                        "team_member_url": team_member_url,
-                    },
-                )
-            else:
-                member.stats["status"] = player_data[0]
-                member.image_url = player_data[3]
-            if not member in team.members:
-                team.members.append(member)
+                        member_pk_name: member_id,
+                        # Index 0 contains status, index 3 contains image URL
+                        "stats": {**(stats or {}), "status": players_data[url][1][0]},
+                        "image_url": players_data[url][1][3],
+                    }
+                    for url, (member_id, stats) in existing.items()
+                ],
+            )
+
+        member_ids = [member_id for member_id, _ in existing.values()]
+        new_members = [
+            {
+                "nickname": nickname,
+                "country": player_data[2],  # Index 2 contains country
+                "stats": {"status": player_data[0]},  # Index 0 contains status
+                "image_url": player_data[3],  # Index 3 contains image URL
+                "team_member_url": url,
+            }
+            for url, (nickname, player_data) in players_data.items()
+            if url not in existing
+        ]
+        if new_members:
+            result = await session.execute(
+                insert(TeamMember)
+                .values(new_members)
+                .on_conflict_do_nothing(index_elements=["team_member_url"])
+                .returning(member_pk)
+            )
+            member_ids.extend(result.scalars().all())
+
+        team_id = primary_key(team)
+        await link_rows(
+            session, Team.members, [(team_id, member_id) for member_id in member_ids]
+        )
 
 
-class CSPlayersPipeline:
+class CSPlayersPipeline(WriteBehindPipeline):
     """Pipeline for processing and storing player information."""
 
-    async def process_item(
-        self, item: dict[str, Any], spider: scrapy.Spider
-    ) -> dict[str, Any]:
+    def open_spider(self, spider: scrapy.Spider) -> None:
+        """Start a fresh identity map for the crawl."""
+        super().open_spider(spider)
+        self.team_ids: dict[str, Any] = {}
+        self.member_ids: dict[str, Any] = {}
+        self.team_links: set[tuple[Any, Any]] = set()
+
+    async def store_item(self, item: dict[str, Any], spider: scrapy.Spider) -> None:
         """
         Store player information in the database.
 
@@ -408,58 +1126,21 @@ class CSPlayersPipeline:
             item: The scraped player data.
             spider: The spider instance.
 
-        Returns:
-            dict: The processed item.
-
         """
+        member_url = item.get("team_member_url")
+        member_id = self.member_ids.get(member_url)
         async with new_session() as session:
-            # Check if player exists by nickname
-            stmt = select(TeamMember).filter_by(
-                team_member_url=item.get("team_member_url")
-            )
-            print(item.get("team_member_url"))
-            result = await session.execute(stmt)
-            player = result.scalar_one_or_none()
-
-            if not player:
-                player = TeamMember()
-
-            update_object(
-                player,
-                {
-                    "nickname": item.get("player_nickname"),
-                    "name": item.get("player_name"),
-                    "age": int(item.get("player_age"))
-                    if item.get("player_age") is not None
-                    else None,
-                    "country": item.get("player_country"),
-                    "team_member_url": item.get("team_member_url"),
-                    "image_url": item.get("image_url"),
-                },
-            )
-
-            if not player.stats:
-                player.stats = {}
-
-            player.stats.update({
-                "games_last_year": item.get("player_played_games_last_year"),
-                "games_overall": item.get("player_played_games_overall"),
-                "status": item.get("player_status"),
-            })
-
-            team_stmt = (
-                select(Team)
-                .options(joinedload(Team.members))
-                .filter_by(team_url=item.get("team_page_link"))
-            )
-            result = await session.execute(team_stmt)
-            team = result.unique().scalar_one_or_none()
-
-            if team and player not in team.members:
-                team.members.append(player)
-
-            if not player in session:
-                session.add(player)
+            team_id = await self._get_team_id(item.get("team_page_link"), session)
+            # A player seen earlier in the crawl only needs a missing team link
+            if member_id is not None and (
+                team_id is None or (team_id, member_id) in self.team_links
+            ):
+                return
+            if member_id is None:
+                member_id = await self._upsert_player(item, session)
+
+            if team_id is not None and (team_id, member_id) not in self.team_links:
+                await link_rows(session, Team.members, [(team_id, member_id)])
 
             try:
                 await session.commit()
@@ -469,68 +1150,245 @@ class CSPlayersPipeline:
             except Exception as e:
                 spider.logger.error(f"Error: {e}")
                 await session.rollback()
-        return item
+            else:
+                self.member_ids[member_url] = member_id
+                if team_id is not None:
+                    self.team_links.add((team_id, member_id))
 
+    @staticmethod
+    async def _upsert_player(item: dict[str, Any], session: AsyncSession) -> Any:
+        """Create or update the player and return its primary key."""
+        player_data = {
+            "nickname": item.get("player_nickname"),
+            "name": item.get("player_name"),
+            "age": int(item.get("player_age"))
+            if item.get("player_age") is not None
+            else None,
+            "country": item.get("player_country"),
+            "team_member_url": item.get("team_member_url"),
+            "image_url": item.get("image_url"),
+            "stats": {
+                "games_last_year": item.get("player_played_games_last_year"),
+                "games_overall": item.get("player_played_games_overall"),
+                "status": item.get("player_status"),
+            },
+        }
+        stmt = insert(TeamMember).values(**player_data)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["team_member_url"],
+            set_={key: stmt.excluded[key] for key in player_data},
+        ).returning(inspect(TeamMember).primary_key[0])
+        return await session.scalar(stmt)
+
+    async def _get_team_id(self, team_url: str, session: AsyncSession) -> Any:
+        """
+        Resolve the primary key of a team, querying each found team only once.
 
-class CSPastMatchesPostgresPipeline:
-    """Pipeline for processing and storing past matches information."""
+        Missing teams are not remembered, as they may be inserted later in
+        the crawl.
+        """
+        if not team_url:
+            return None
+        if team_url not in self.team_ids:
+            team_pk = inspect(Team).primary_key[0]
+            team_id = await session.scalar(select(team_pk).filter_by(team_url=team_url))
+            if team_id is None:
+                return None
+            self.team_ids[team_url] = team_id
+        return self.team_ids[team_url]
+
+
+class CSPastMatchesPostgresPipeline(BatchingPipeline):
+    """
+    Pipeline for processing and storing past matches information.
+
+    With ``PIPELINE_FAST_PATH`` enabled a batch is written with set-based
+    statements, falling back to writing the items one by one if that fails.
+    """
+
+    def __init__(self, crawler: Crawler) -> None:
+        """Read whether the fast path is enabled."""
+        super().__init__(crawler)
+        self.fast_path = crawler.settings.getbool("PIPELINE_FAST_PATH")
+
+    async def write_batch(
+        self,
+        items: list[dict[str, Any]],
+        session: AsyncSession,
+        spider: scrapy.Spider,
+    ) -> list[dict[str, Any]]:
+        """
+        Insert the missing matches and set the results of the whole batch.
+
+        Returns:
+            list: The items that were written successfully.
 
-    async def process_item(
-        self, item: dict[str, Any], spider: scrapy.Spider
-    ) -> dict[str, Any]:
         """
-        Store past match information in the database.
+        if not self.fast_path:
+            return await super().write_batch(items, session, spider)
+
+        sport_id = await get_sport_id("CS2")
+        matches = {
+            item.get("external_id"): {
+                "external_id": item.get("external_id"),
+                "match_name": item.get("match_name"),
+                "planned_start_datetime": item.get("date"),
+                "sport_id": sport_id,
+            }
+            for item in items
+        }
+        try:
+            async with session.begin_nested():
+                await session.execute(
+                    insert(Match)
+                    .values(list(matches.values()))
+                    .on_conflict_do_nothing(index_elements=["external_id"])
+                )
+                result = await session.execute(
+                    select(Match.external_id, Match.match_id).where(
+                        Match.external_id.in_(matches)
+                    )
+                )
+                match_ids = dict(result.tuples().all())
+                await upsert_match_statuses(
+                    session,
+                    {
+                        match_ids[item.get("external_id")]: {
+                            "name": MatchStatusEnum.FINISHED,
+                            "status": {
+                                "team1_score": item.get("team1_score"),
+                                "team2_score": item.get("team2_score"),
+                            },
+                        }
+                        for item in items
+                    },
+                )
+        except Exception as e:  # noqa: BLE001
+            spider.logger.warning(f"Batch upsert failed, writing items one by one: {e}")
+            return await super().write_batch(items, session, spider)
+        return items
+
+    async def load_batch(
+        self,
+        items: list[dict[str, Any]],
+        session: AsyncSession,
+        spider: scrapy.Spider,
+    ) -> list[dict[str, Any]]:
+        """
+        COPY the results into a staging table and merge them set-based.
 
-        Args:
-            item: The scraped match data.
-            spider: The spider instance.
+        Missing matches are inserted with one statement, then the statuses of
+        all matches of the batch are updated or inserted with one statement
+        each.
 
         Returns:
-            dict: The processed item.
+            list: The items of the batch.
 
         """
-        async with new_session() as session:
-            sport = await poll_sport_by_name("CS2")
+        stage = await copy_to_staging(
+            session,
+            "match_stage",
+            select(
+                Match.external_id,
+                Match.match_name,
+                Match.planned_start_datetime,
+                MatchStatus.status,
+            ).join_from(Match, MatchStatus),
+            [
+                (
+                    item.get("external_id"),
+                    item.get("match_name"),
+                    item.get("date"),
+                    {
+                        "team1_score": item.get("team1_score"),
+                        "team2_score": item.get("team2_score"),
+                    },
+                )
+                for item in items
+            ],
+        )
+        sport_id = await get_sport_id("CS2")
+        await session.execute(
+            insert(Match)
+            .from_select(
+                ["external_id", "match_name", "planned_start_datetime", "sport_id"],
+                select(
+                    stage.c.external_id,
+                    stage.c.match_name,
+                    stage.c.planned_start_datetime,
+                    literal(sport_id),
+                ).distinct(stage.c.external_id),
+            )
+            .on_conflict_do_nothing(index_elements=["external_id"])
+        )
 
-            stmt = (
-                select(Match)
-                .options(joinedload(Match.match_status))
-                .filter_by(external_id=item.get("external_id"))
+        match_pk, match_fk = Match.match_status.property.local_remote_pairs[0]
+        results = (
+            select(match_pk, stage.c.status)
+            .join(stage, Match.external_id == stage.c.external_id)
+            .distinct(stage.c.external_id)
+            .subquery()
+        )
+        finished = literal(MatchStatusEnum.FINISHED, MatchStatus.name.type)
+        await session.execute(
+            update(MatchStatus)
+            .where(match_fk == results.c[match_pk.name])
+            .values(name=finished, status=results.c.status)
+            .execution_options(synchronize_session=False)
+        )
+        await session.execute(
+            insert(MatchStatus).from_select(
+                [match_fk.name, "name", "status"],
+                select(results.c[match_pk.name], finished, results.c.status).where(
+                    ~exists().where(match_fk == results.c[match_pk.name])
+                ),
             )
-            result = await session.execute(stmt)
-            match = result.scalar_one_or_none()
+        )
+        return items
 
-            if not match:
-                match = Match()
-                match.sport = sport
-                match.match_name = item.get("match_name")
-                match.external_id = item.get("external_id")
+    async def write_item(
+        self, item: dict[str, Any], session: AsyncSession, spider: scrapy.Spider
+    ) -> None:
+        """
+        Store past match information.
 
-                match_status = MatchStatus()
-                match_status.name = MatchStatusEnum.FINISHED
-                match_status.status = {
-                    "team1_score": item.get("team1_score"),
-                    "team2_score": item.get("team2_score"),
-                }
-                match.match_status = match_status
+        Args:
+            item: The scraped match data.
+            session: The session of the current batch.
+            spider: The spider instance.
 
-                # Set match dates - date is already parsed by the loader
-                match.planned_start_datetime = item.get("date")
+        """
+        sport_id = await get_sport_id("CS2")
 
-                session.add(match)
-            else:
-                match.match_status.name = MatchStatusEnum.FINISHED
-                match.match_status.status = {
-                    "team1_score": item.get("team1_score"),
-                    "team2_score": item.get("team2_score"),
-                }
+        stmt = (
+            select(Match)
+            .options(joinedload(Match.match_status))
+            .filter_by(external_id=item.get("external_id"))
+        )
+        result = await session.execute(stmt)
+        match = result.scalar_one_or_none()
+
+        if not match:
+            match = Match()
+            match.sport_id = sport_id
+            match.match_name = item.get("match_name")
+            match.external_id = item.get("external_id")
+
+            match_status = MatchStatus()
+            match_status.name = MatchStatusEnum.FINISHED
+            match_status.status = {
+                "team1_score": item.get("team1_score"),
+                "team2_score": item.get("team2_score"),
+            }
+            match.match_status = match_status
 
-            try:
-                await session.commit()
-            except IntegrityError as e:
-                spider.logger.error(f"IntegrityError: {e}")
-                await session.rollback()
-            except Exception as e:
-                spider.logger.error(f"Error: {e}")
-                await session.rollback()
-        return item
+            # Set match dates - date is already parsed by the loader
+            match.planned_start_datetime = item.get("date")
+
+            session.add(match)
+        else:
+            match.match_status.name = MatchStatusEnum.FINISHED
+            match.match_status.status = {
+                "team1_score": item.get("team1_score"),
+                "team2_score": item.get("team2_score"),
+            }
@@ -0,0 +1,105 @@
+"""On-disk cache for pages rendered by PatchrightMiddleware."""
+
+import gzip
+import re
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from time import time
+
+from scrapy import Request
+from scrapy.crawler import Crawler
+from scrapy.utils.project import data_path
+
+
+class RenderCache:
+    """
+    Gzip-compressed store of rendered HTML keyed by request fingerprint.
+
+    Entries live in ``PATCHRIGHT_CACHE_DIR``, so every scrapyd job started
+    from the same working directory (or pointed at the same absolute path)
+    shares them. ``PATCHRIGHT_CACHE_POLICIES`` is a list of
+    ``(url_regex, ttl)`` pairs where the first matching pattern wins; a TTL of
+    0 never expires and a negative TTL disables caching for those URLs.
+    URLs without a matching pattern use ``PATCHRIGHT_CACHE_DEFAULT_TTL``.
+    Requests capturing network responses or extracting data in the page are
+    never cached, as their results are not the page's HTML.
+    """
+
+    def __init__(self, crawler: Crawler) -> None:
+        """Read the cache configuration from the crawler settings."""
+        settings = crawler.settings
+        self.enabled = settings.getbool("PATCHRIGHT_CACHE_ENABLED")
+        self.cache_dir = Path(
+            data_path(settings["PATCHRIGHT_CACHE_DIR"], createdir=True)
+        )
+        self.default_ttl = settings.getint("PATCHRIGHT_CACHE_DEFAULT_TTL")
+        self.policies = [
+            (re.compile(pattern), ttl)
+            for pattern, ttl in settings.getlist("PATCHRIGHT_CACHE_POLICIES")
+        ]
+        self.fingerprinter = crawler.request_fingerprinter
+        self.stats = crawler.stats
+
+    def ttl_for(self, url: str) -> int:
+        """Return the TTL in seconds that applies to the URL."""
+        for pattern, ttl in self.policies:
+            if pattern.search(url):
+                return ttl
+        return self.default_ttl
+
+    def is_cacheable(self, request: Request) -> bool:
+        """Check whether the request may be served from or stored in the cache."""
+        return (
+            self.enabled
+            and not request.meta.get("dont_cache")
+            and not request.meta.get("capture")
+            and not request.meta.get("extract")
+            and self.ttl_for(request.url) >= 0
+        )
+
+    def retrieve(self, request: Request) -> str | None:
+        """Return the cached HTML of the request, or None on a miss."""
+        if not self.is_cacheable(request):
+            return None
+
+        path = self._path(request)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            self.stats.inc_value("patchright/cache/misses")
+            return None
+
+        ttl = self.ttl_for(request.url)
+        if ttl and time() - stat.st_mtime > ttl:
+            self.stats.inc_value("patchright/cache/expired")
+            self.stats.inc_value("patchright/cache/misses")
+            return None
+
+        try:
+            content = gzip.decompress(path.read_bytes()).decode("utf-8")
+        except (OSError, EOFError):
+            self.stats.inc_value("patchright/cache/misses")
+            return None
+        self.stats.inc_value("patchright/cache/hits")
+        self.stats.inc_value("patchright/cache/bytes_read", stat.st_size)
+        return content
+
+    def store(self, request: Request, content: str) -> None:
+        """Write the rendered HTML of the request to the cache."""
+        if not self.is_cacheable(request):
+            return
+
+        path = self._path(request)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = gzip.compress(content.encode("utf-8"), compresslevel=6)
+        # Write to a temporary file first, so that concurrent jobs never read
+        # a partially written entry.
+        with NamedTemporaryFile(dir=path.parent, delete=False) as tmp:
+            tmp.write(data)
+        Path(tmp.name).replace(path)
+        self.stats.inc_value("patchright/cache/stores")
+        self.stats.inc_value("patchright/cache/bytes_written", len(data))
+
+    def _path(self, request: Request) -> Path:
+        key = self.fingerprinter.fingerprint(request).hex()
+        return self.cache_dir / key[:2] / f"{key}.html.gz"
@@ -0,0 +1,106 @@
+"""Per-phase timings of pages rendered by PatchrightMiddleware."""
+
+import json
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from math import ceil
+from pathlib import Path
+from time import monotonic, time
+from typing import IO
+
+from scrapy import Request, Spider
+from scrapy.crawler import Crawler
+from scrapy.utils.httpobj import urlparse_cached
+
+
+@contextmanager
+def timed(timings: dict[str, float] | None, phase: str) -> Iterator[None]:
+    """Add the time spent in the body to ``timings[phase]``."""
+    if timings is None:
+        yield
+        return
+    started = monotonic()
+    try:
+        yield
+    finally:
+        timings[phase] = timings.get(phase, 0) + monotonic() - started
+
+
+def percentile(samples: list[float], p: float) -> float:
+    """Return the nearest-rank percentile of sorted samples."""
+    return samples[max(ceil(p / 100 * len(samples)) - 1, 0)]
+
+
+class RenderTimings:
+    """
+    Collects how long every phase of a rendered request took.
+
+    A request's phases are ``pool_wait`` (waiting for a free context),
+    ``launch`` (starting the browser), ``context`` (creating a context),
+    ``goto`` (until DOMContentLoaded), ``networkidle``, ``ready`` (waiting for
+    ``meta["ready_selector"]``), ``delay`` (``meta["delay"]``), ``session``
+    (saving the storage state or handing cookies off), ``capture`` (reading
+    captured responses), ``extract`` or ``content`` (serializing the page)
+    and ``release`` (returning or closing the context), plus their
+    ``total``. Phases a request did not go through are
+    left out.
+
+    When the spider closes, ``PATCHRIGHT_TIMING_PERCENTILES`` of every phase
+    are written to the stats as ``patchright/timing/<phase>/p<n>`` for the
+    spider and ``patchright/timing/<domain>/<phase>/p<n>`` per domain. If
+    ``PATCHRIGHT_TRACE_FILE`` is set, the raw timings of every request are
+    appended to it as JSON lines.
+    """
+
+    def __init__(self, crawler: Crawler) -> None:
+        """Read the timing configuration from the crawler settings."""
+        settings = crawler.settings
+        self.percentiles = settings.getlist("PATCHRIGHT_TIMING_PERCENTILES")
+        self.trace_path = settings.get("PATCHRIGHT_TRACE_FILE")
+        self.stats = crawler.stats
+        self.samples: defaultdict[tuple[str, str], list[float]] = defaultdict(list)
+        self._trace: IO[str] | None = None
+
+    def record(
+        self,
+        request: Request,
+        spider: Spider,
+        timings: dict[str, float],
+        status: int | None,
+    ) -> None:
+        """Add the phase timings of one rendered request."""
+        domain = urlparse_cached(request).hostname
+        for phase, seconds in timings.items():
+            self.samples["", phase].append(seconds)
+            self.samples[domain, phase].append(seconds)
+
+        if self.trace_path:
+            if self._trace is None:
+                path = Path(self.trace_path)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                self._trace = path.open("a", encoding="utf-8")
+            record = {
+                "time": time(),
+                "spider": spider.name,
+                "domain": domain,
+                "url": request.url,
+                "status": status,
+                "timings": timings,
+            }
+            self._trace.write(json.dumps(record) + "\n")
+
+    def close(self, spider: Spider) -> None:
+        """Write the percentiles to the stats and close the trace file."""
+        for (domain, phase), samples in self.samples.items():
+            samples.sort()
+            prefix = f"patchright/timing/{domain}/" if domain else "patchright/timing/"
+            for p in self.percentiles:
+                self.stats.set_value(
+                    f"{prefix}{phase}/p{p}",
+                    percentile(samples, float(p)),
+                    spider=spider,
+                )
+        if self._trace:
+            self._trace.close()
+            self._trace = None
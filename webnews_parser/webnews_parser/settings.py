@@ -13,6 +13,59 @@ PLAYWRIGHT_USER_AGENTS = [
 
 PLAYWRIGHT_ARGS = ["--window-size=1920,1080", "--disable-popup-blocking"]
 
+PATCHRIGHT_HEADLESS = True
+# Number of browser contexts rendering at once; PATCHRIGHT_MAX_CONTEXTS
+# defaults to CONCURRENT_REQUESTS when it is not set
+# A context is closed and replaced after this many navigations
+PATCHRIGHT_MAX_NAVIGATIONS_PER_CONTEXT = 50
+# Default timeout of every page action, in milliseconds
+PATCHRIGHT_DEFAULT_TIMEOUT = 120000
+# Seconds to wait for meta["ready_selector"] before reloading the page
+PATCHRIGHT_READY_TIMEOUT = 15
+# In-page reloads before a page that never became ready is returned as is
+PATCHRIGHT_READY_RELOADS = 2
+# Percentiles of every render phase reported in the stats
+PATCHRIGHT_TIMING_PERCENTILES = [50, 90, 99]
+# Append the phase timings of every rendered request to this JSONL file
+PATCHRIGHT_TRACE_FILE = None
+# Blocked by the browser on every rendered page, besides spider.blocked_resources
+PATCHRIGHT_BLOCKED_DOMAINS = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "adservice.google.com",
+    "amazon-adsystem.com",
+    "connect.facebook.net",
+    "mc.yandex.ru",
+    "hotjar.com",
+    "scorecardresearch.com",
+]
+# Pages on these domains load every subrequest
+PATCHRIGHT_BLOCKING_EXEMPT_DOMAINS = ["hltv.org"]
+# Cookies and localStorage saved per domain and loaded into new browser contexts,
+# shared through PATCHRIGHT_STORAGE_STATE_REDIS_URL (or the REDIS_URL environment
+# variable) or else through files in PATCHRIGHT_STORAGE_STATE_DIR
+PATCHRIGHT_STORAGE_STATE_ENABLED = True
+PATCHRIGHT_STORAGE_STATE_DIR = "storagestate"
+PATCHRIGHT_STORAGE_STATE_REDIS_URL = None
+# Seconds a saved state is loaded into new contexts
+PATCHRIGHT_STORAGE_STATE_TTL = 60 * 60
+# Seconds between two saves of the same domain
+PATCHRIGHT_STORAGE_STATE_SAVE_INTERVAL = 5 * 60
+
+# Cache of browser-rendered pages, shared by every job using the same directory
+PATCHRIGHT_CACHE_ENABLED = False
+PATCHRIGHT_CACHE_DIR = "rendercache"
+# TTL in seconds of URLs without a matching policy
+PATCHRIGHT_CACHE_DEFAULT_TTL = 3 * 60 * 60
+# (url regex, TTL in seconds); 0 never expires, a negative TTL disables caching
+PATCHRIGHT_CACHE_POLICIES = [
+    (r"hltv\.org/news/archive/", 10 * 60),
+    (r"hltv\.org/news/\d+/", 0),
+    (r"-vs-[^/]+-\d+$", 30),
+]
+
 CONCURRENT_REQUESTS = 8
 CONCURRENT_REQUESTS_PER_DOMAIN = 8
 
@@ -21,8 +74,37 @@ RETRY_TIMES = 4
 RETRY_WAIT_TIME = 20
 RETRY_HTTP_CODES = [429, 400, 504, 500, 502, 503]
 
+# Requests per second per domain, shared by every job using the same Redis
+# (RATE_LIMIT_REDIS_URL, or the REDIS_URL environment variable). Without Redis
+# each job limits itself in memory.
+RATE_LIMIT_ENABLED = True
+RATE_LIMIT_REDIS_URL = None
+# Seconds to wait for Redis before falling back to memory
+RATE_LIMIT_REDIS_TIMEOUT = 1
+RATE_LIMIT_DEFAULT_RATE = 2
+RATE_LIMIT_BURST = 5
+RATE_LIMIT_RATES = {
+    "escorenews.com": 1,
+}
+
 TELNETCONSOLE_ENABLED = False
 
+EXTENSIONS = {
+    "webnews_parser.extensions.ReferenceDataCacheExtension": 500,
+    "webnews_parser.extensions.ChromiumWatchdogExtension": 510,
+}
+# Seconds before cached reference rows (sports) are reloaded
+REFERENCE_CACHE_TTL = 60 * 60
+
+# Restarts Chromium when it uses too much memory and kills the browsers of dead jobs
+CHROMIUM_WATCHDOG_ENABLED = True
+# Browser PIDs recorded per job, shared by every job using the same directory
+CHROMIUM_WATCHDOG_PID_DIR = "chromiumpids"
+# Seconds between two samples of the Chromium memory
+CHROMIUM_WATCHDOG_INTERVAL = 10
+# Chromium is restarted when its processes use more memory (0 never restarts it)
+CHROMIUM_WATCHDOG_MAX_RSS_MB = 2048
+
 
 AUTOTHROTTLE_ENABLED = True
 # The initial download delay
@@ -40,9 +122,31 @@ HTTPCACHE_ENABLED = True
 HTTPCACHE_EXPIRATION_SECS = 0
 HTTPCACHE_DIR = "httpcache"
 HTTPCACHE_STORAGE = "scrapy.extensions.httpcache.FilesystemCacheStorage"
+# Challenge pages and pages missing their ready selector are not stored
+HTTPCACHE_POLICY = "webnews_parser.http_cache.ChallengeAwarePolicy"
 HTTPCACHE_IGNORE_HTTP_CODES = [500, 502, 503, 504, 429, 400]
 
 TWISTED_REACTOR = "twisted.internet.asyncioreactor.AsyncioSelectorReactor"
 
 
 FEED_EXPORT_ENCODING = "utf-8"
+
+# Batching pipelines write every N items, every T seconds and on close
+PIPELINE_BATCH_SIZE = 50
+PIPELINE_BATCH_INTERVAL = 5
+# Batch size of spiders started with -a bulk_load=1 for backfills
+PIPELINE_BULK_LOAD_BATCH_SIZE = 5000
+# Write live match updates and past match results with plain statements
+# instead of loading them into the ORM session
+PIPELINE_FAST_PATH = True
+
+# Hashes of stored items, used to skip rewriting unchanged entities
+CONTENT_HASH_DIR = "contenthashes"
+# Seconds after which an unchanged item is written again anyway
+CONTENT_HASH_TTL = 6 * 60 * 60
+
+# Release items right away and store them from a bounded queue drained by
+# writer tasks; the engine only waits for the database when the queue is full
+PIPELINE_WRITE_BEHIND = False
+PIPELINE_WRITE_BEHIND_QUEUE_SIZE = 1000
+PIPELINE_WRITE_BEHIND_WORKERS = 4
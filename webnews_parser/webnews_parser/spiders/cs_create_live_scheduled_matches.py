@@ -21,8 +21,10 @@ class CSCreateLiveScheduledMatchesSpider(scrapy.Spider):
         "DOWNLOADER_MIDDLEWARES": {
             "scrapy.downloadermiddlewares.useragent.UserAgentMiddleware": None,
             "scrapy_user_agents.middlewares.RandomUserAgentMiddleware": None,
+            "scrapy.downloadermiddlewares.retry.RetryMiddleware": None,
             "webnews_parser.middlewares.PatchrightMiddleware": 542,
-            "webnews_parser.middlewares.TooManyRequestsRetryMiddleware": 543,
+            "webnews_parser.middlewares.RateLimitMiddleware": 543,
+            "webnews_parser.middlewares.TooManyRequestsRetryMiddleware": 541,
         },
         "ITEM_PIPELINES": {
             "webnews_parser.pipelines.CSCreateLiveScheduledMatchesPipeline": 100,
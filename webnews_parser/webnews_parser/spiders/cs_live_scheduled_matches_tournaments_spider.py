@@ -31,7 +31,8 @@ class CSlsMatchesTournamentsSpider(Spider):
             "scrapy_user_agents.middlewares.RandomUserAgentMiddleware": None,
             "scrapy.downloadermiddlewares.retry.RetryMiddleware": None,
             "webnews_parser.middlewares.PatchrightMiddleware": 542,
-            "webnews_parser.middlewares.TooManyRequestsRetryMiddleware": 543,
+            "webnews_parser.middlewares.RateLimitMiddleware": 543,
+            "webnews_parser.middlewares.TooManyRequestsRetryMiddleware": 541,
             "scrapy.downloadermiddlewares.httpcompression.HttpCompressionMiddleware": 810,
         },
         "ITEM_PIPELINES": {
@@ -221,6 +222,7 @@ class CSlsMatchesTournamentsSpider(Spider):
                         url=tournament_link,
                         callback=self.parse_tournament_page,
                         cb_kwargs=placeholder_dict,
+                        meta={"render": "handoff", "ready_selector": "div.hh h1"},
                         dont_filter=True,
                     )
             else:
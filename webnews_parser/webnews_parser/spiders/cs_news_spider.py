@@ -4,8 +4,9 @@ from html import unescape
 from typing import Any, Iterator
 
 from dotenv import load_dotenv
-from scrapy import Request, Spider
+from scrapy import Request, signals, Spider
 from scrapy.http import Response
+from scrapy.utils.defer import deferred_from_coro
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 import calendar
@@ -13,6 +14,7 @@ from webnews_parser.settings import PLAYWRIGHT_ARGS, PLAYWRIGHT_USER_AGENTS
 
 from ..items import CSNewsItem
 from ..loaders import CSNewsItemLoader
+from ..utils.db_utils import poll_known_news_urls
 from ..utils.spider_utils import clean_text
 
 
@@ -21,6 +23,7 @@ class CSNewsSpider(Spider):
     A spider to scrape and parse CS:GO news articles.
 
     Fetches news articles including headers, text content, and metadata.
+    Start it with ``-a bulk_load=1`` to backfill history with COPY.
     """
 
     name: str = "CSNewsSpider"
@@ -44,12 +47,28 @@ class CSNewsSpider(Spider):
         "DOWNLOAD_TIMEOUT": 120,
         "DB_URL": os.getenv("DB_URL"),
         "HTTPCACHE_ENABLED": True,
+        "PATCHRIGHT_CACHE_ENABLED": True,
     }
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
         self.browser_args = PLAYWRIGHT_ARGS
         self.user_agent = random.choice(PLAYWRIGHT_USER_AGENTS)
+        self.known_news_urls: set[str] = set()
+
+    @classmethod
+    def from_crawler(cls, crawler, *args: Any, **kwargs: Any) -> "CSNewsSpider":
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        crawler.signals.connect(spider.spider_opened, signal=signals.spider_opened)
+        return spider
+
+    def spider_opened(self):
+        """Preload the URLs of already stored news before crawling starts."""
+        return deferred_from_coro(self._load_known_news_urls())
+
+    async def _load_known_news_urls(self) -> None:
+        self.known_news_urls = await poll_known_news_urls()
+        self.logger.info(f"Loaded {len(self.known_news_urls)} known news URLs.")
 
     def start_requests(self) -> Iterator[Request]:
         """
@@ -87,11 +106,14 @@ class CSNewsSpider(Spider):
             next_url = response.urljoin(url=paragraph.css("::attr(href)").get())
             if next_url:
                 rel_url = paragraph.css("::attr(href)").get()
+                if rel_url in self.known_news_urls:
+                    self.crawler.stats.inc_value("news/known_urls_skipped")
+                    continue
                 yield Request(
                     url=next_url,
                     callback=self.parse_news,
                     cb_kwargs={"rel_url": rel_url},
-                    meta={"no_wait_until_networkidle": True},
+                    meta={"render": "handoff", "ready_selector": "p.news-block"},
                 )
 
     def parse_news(self, response: Response, **kwargs: Any) -> Iterator[CSNewsItem]:
@@ -23,6 +23,7 @@ class CSpMatchesSpider(Spider):
     A spider to scrape and parse CS:GO past matches data.
 
     Fetches match details including teams, scores, and dates.
+    Start it with ``-a bulk_load=1`` to backfill history with COPY.
     """
 
     name: str = "CSpMatchesSpider"
@@ -33,7 +34,8 @@ class CSpMatchesSpider(Spider):
             "scrapy_user_agents.middlewares.RandomUserAgentMiddleware": None,
             "scrapy.downloadermiddlewares.retry.RetryMiddleware": None,
             "webnews_parser.middlewares.PatchrightMiddleware": 542,
-            "webnews_parser.middlewares.TooManyRequestsRetryMiddleware": 543,
+            "webnews_parser.middlewares.RateLimitMiddleware": 543,
+            "webnews_parser.middlewares.TooManyRequestsRetryMiddleware": 541,
             "scrapy.downloadermiddlewares.httpcompression.HttpCompressionMiddleware": 810,
         },
         "ITEM_PIPELINES": {
@@ -64,7 +66,14 @@ class CSpMatchesSpider(Spider):
         """
         for page_num in range(1, 5):
             url = f"{self.base_url}/en/csgo/matches?s2={page_num}"
-            yield Request(url=url, callback=self.parse)
+            yield Request(
+                url=url,
+                callback=self.parse,
+                meta={
+                    "render": "auto",
+                    "ready_selector": "div#matches_s2.flex-table a.article",
+                },
+            )
 
     def parse(self, response: Response, **kwargs: Any) -> Iterator[CSPMatchesItem]:
         """
@@ -12,7 +12,34 @@ from webnews_parser.settings import PLAYWRIGHT_ARGS, PLAYWRIGHT_USER_AGENTS
 
 from ..items import CSPlayersItem
 from ..loaders import CSPlayersItemLoader
-from ..utils.spider_utils import css_mutator, xpath_mutator, xpath_mutator_all
+
+# Reads the raw player fields inside the page, so that only they come back
+# from the browser. The info table has an extra "Top places" row first on
+# the standard layout, which shifts every other row by one.
+PLAYER_EXTRACT_SCRIPT = """
+() => {
+    const ownText = (node) => {
+        const text = node && Array.from(node.childNodes)
+            .find((child) => child.nodeType === Node.TEXT_NODE);
+        return text ? text.data : "";
+    };
+    const cell = (row, selector = "td") => document.querySelector(
+        `table.tinfo.table.table-sm tbody tr:nth-child(${row}) ${selector}`,
+    );
+    const heading = document.querySelector("div.col-lg-8 h1");
+    const offset = ownText(cell(1, "th")).trim() === "Top places" ? 1 : 0;
+    return {
+        player_nickname: ownText(heading),
+        player_name: ownText(heading && heading.querySelector("small")),
+        age: ownText(cell(2 + offset)),
+        country: ownText(cell(3 + offset)),
+        games_last_year: ownText(cell(6 + offset)),
+        games_overall: ownText(cell(6 + offset, "td span.text-muted")),
+        image_url: document.querySelector("div.col-lg-4 img")
+            ?.getAttribute("src") ?? null,
+    };
+}
+"""
 
 
 class CSPlayersSpider(Spider):
@@ -30,7 +57,8 @@ class CSPlayersSpider(Spider):
             "scrapy_user_agents.middlewares.RandomUserAgentMiddleware": None,
             "scrapy.downloadermiddlewares.retry.RetryMiddleware": None,
             "webnews_parser.middlewares.PatchrightMiddleware": 542,
-            "webnews_parser.middlewares.TooManyRequestsRetryMiddleware": 543,
+            "webnews_parser.middlewares.RateLimitMiddleware": 543,
+            "webnews_parser.middlewares.TooManyRequestsRetryMiddleware": 541,
             "scrapy.downloadermiddlewares.httpcompression.HttpCompressionMiddleware": 810,
         },
         "ITEM_PIPELINES": {
@@ -104,7 +132,10 @@ class CSPlayersSpider(Spider):
             yield Request(
                 url=full_url,
                 callback=self.parse_player,
-                meta={"delay": 10},
+                meta={
+                    "ready_selector": "div.col-lg-8 h1",
+                    "extract": PLAYER_EXTRACT_SCRIPT,
+                },
                 cb_kwargs={
                     "player_status": player_status,
                     "player_team": response.url.split("/")[-1],
@@ -119,37 +150,19 @@ class CSPlayersSpider(Spider):
         Parse individual player pages and extract player data.
 
         Args:
-            response: The response containing the player page.
+            response: The response with the fields of PLAYER_EXTRACT_SCRIPT.
             **kwargs: Additional keyword arguments.
 
         Yields:
             CSPlayersItem: Processed player data item.
         """
-        retry_times = response.meta.get("retry_times", 0)
-        max_retries = 3
-
-        player_nickname = css_mutator("div.col-lg-8 h1::text", response)
+        fields = response.json()
 
-        if not player_nickname and retry_times < max_retries:
-            yield Request(
-                url=response.url,
-                callback=self.parse_player,
-                meta={"delay": 10, "retry_times": retry_times + 1},
-                cb_kwargs=kwargs,
-                dont_filter=True,
-            )
+        if not fields["player_nickname"].strip():
+            self.logger.warning(f"No player data on {response.url}, skipping.")
             return
 
-        table_selector = response.css("table.tinfo.table.table-sm tbody")
-
-        is_standard_layout = (
-            css_mutator("tr:nth-child(1) th::text", table_selector).strip()
-            == "Top places"
-        )
-
-        player_data = self._extract_player_data(
-            response, table_selector, is_standard_layout
-        )
+        player_data = self._extract_player_data(response, fields)
 
         loader = CSPlayersItemLoader(item=CSPlayersItem())
         for field, value in player_data.items():
@@ -161,52 +174,30 @@ class CSPlayersSpider(Spider):
         yield item
 
     def _extract_player_data(
-        self, response: Response, table_selector: Response, is_standard_layout: bool
+        self, response: Response, fields: dict[str, str | None]
     ) -> dict[str, str]:
         """
-        Extract player information from the response.
+        Build player information from the fields extracted in the page.
 
         Args:
-            response: The full response object.
-            table_selector: The table section of the response.
-            is_standard_layout: Whether the page uses standard layout.
+            response: The response of the player page.
+            fields: The raw fields returned by PLAYER_EXTRACT_SCRIPT.
 
         Returns:
             dict: Dictionary containing player data.
         """
-        indices = {
-            "team": 5 if is_standard_layout else 4,
-            "country": 4 if is_standard_layout else 3,
-            "age": 3 if is_standard_layout else 2,
-            "games": 7 if is_standard_layout else 6,
-        }
-
-        team_selector = css_mutator(
-            f"tr:nth-child({indices["team"]}) td a::attr(href)", table_selector
-        )
-        country_selector = css_mutator(
-            f"tr:nth-child({indices["country"]}) td::text", table_selector
-        )
-        age_selector = css_mutator(
-            f"tr:nth-child({indices["age"]}) td::text", table_selector
-        )
-        games_selector_1 = css_mutator(
-            f"tr:nth-child({indices["games"]}) td::text", table_selector
-        )
-        games_selector_2 = css_mutator(
-            f"tr:nth-child({indices["games"]}) td span.text-muted::text", table_selector
-        )
-
         return {
-            "player_nickname": css_mutator("div.col-lg-8 h1::text", response).strip(),
-            "player_name": css_mutator("div.col-lg-8 h1 small::text", response).strip(),
-            "player_age": age_selector.strip().split(" ")[0],
-            "player_country": country_selector.strip(),
-            "player_played_games_last_year": games_selector_1.split("/")[0].strip(),
-            "player_played_games_overall": games_selector_2.strip(),
+            "player_nickname": fields["player_nickname"].strip(),
+            "player_name": fields["player_name"].strip(),
+            "player_age": fields["age"].strip().split(" ")[0],
+            "player_country": fields["country"].strip(),
+            "player_played_games_last_year": fields["games_last_year"]
+            .split("/")[0]
+            .strip(),
+            "player_played_games_overall": fields["games_overall"].strip(),
             "player_status": response.cb_kwargs.get("player_status"),
             "team_member_url": urljoin(self.base_url, response.url),
-            "image_url": response.css("div.col-lg-4 img::attr(src)").get(),
+            "image_url": fields["image_url"],
         }
 
     @staticmethod
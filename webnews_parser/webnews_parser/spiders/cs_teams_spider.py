@@ -30,7 +30,8 @@ class CSTeamsSpider(Spider):
             "scrapy_user_agents.middlewares.RandomUserAgentMiddleware": None,
             "scrapy.downloadermiddlewares.retry.RetryMiddleware": None,
             "webnews_parser.middlewares.PatchrightMiddleware": 542,
-            "webnews_parser.middlewares.TooManyRequestsRetryMiddleware": 543,
+            "webnews_parser.middlewares.RateLimitMiddleware": 543,
+            "webnews_parser.middlewares.TooManyRequestsRetryMiddleware": 541,
             "scrapy.downloadermiddlewares.httpcompression.HttpCompressionMiddleware": 810,
         },
         "ITEM_PIPELINES": {
@@ -63,7 +64,11 @@ class CSTeamsSpider(Spider):
         teams_url = f"{self.base_url}/en/csgo/team"
         for page_num in range(1, 3):
             url = f"{teams_url}?s={page_num}"
-            yield Request(url=url, callback=self.parse_teams_page_for_links)
+            yield Request(
+                url=url,
+                callback=self.parse_teams_page_for_links,
+                meta={"render": "auto", "ready_selector": "td.tnm a"},
+            )
 
     def parse_teams_page_for_links(self, response: Response) -> Iterator[Request]:
         """
@@ -82,6 +87,7 @@ class CSTeamsSpider(Spider):
                     base=self.base_url, url=team_page.css("::attr(href)").get()
                 ),
                 callback=self.parse,
+                meta={"render": "handoff", "ready_selector": "section.team-ach tr"},
             )
 
     async def parse(self, response: Response, **kwargs: Any) -> Iterator[CSTeamsItem]:
@@ -91,7 +97,11 @@ class CSTeamsSpider(Spider):
             team_links = [team.team_url for team in teams]
             self.is_team_links_fetched = True
             for team_link in team_links:
-                yield Request(url=team_link, callback=self.parse)
+                yield Request(
+                    url=team_link,
+                    callback=self.parse,
+                    meta={"render": "handoff", "ready_selector": "section.team-ach tr"},
+                )
 
         team_name = response.url.split("/")[-1]
         if (
@@ -10,15 +10,27 @@ from ..utils.spider_utils import css_mutator, extract_teams, xpath_mutator
 
 
 class CSUpdateLiveScheduledMatchesSpider(Spider):
+    """
+    Refresh scores, status and streams of live and scheduled matches.
+
+    Start it with ``-a capture=<regex>`` to record the network responses of
+    match pages whose URL or content type matches, e.g.
+    ``-a capture=application/json``, and log where they came from.
+    """
+
     name = "CSUpdateLiveScheduledMatchesSpider"
+    content_hash_key = "match_id"
     custom_settings = {  # noqa: RUF012
         "DOWNLOADER_MIDDLEWARES": {
             "scrapy.downloadermiddlewares.useragent.UserAgentMiddleware": None,
             "scrapy_user_agents.middlewares.RandomUserAgentMiddleware": None,
+            "scrapy.downloadermiddlewares.retry.RetryMiddleware": None,
             "webnews_parser.middlewares.PatchrightMiddleware": 542,
-            "webnews_parser.middlewares.TooManyRequestsRetryMiddleware": 543,
+            "webnews_parser.middlewares.RateLimitMiddleware": 543,
+            "webnews_parser.middlewares.TooManyRequestsRetryMiddleware": 541,
         },
         "ITEM_PIPELINES": {
+            "webnews_parser.pipelines.SkipUnchangedPipeline": 50,
             "webnews_parser.pipelines.CSUpdateLiveScheduledMatchesPipeline": 100,
         },
         "AUTOTHROTTLE_TARGET_CONCURRENCY": 0.5,
@@ -36,30 +48,36 @@ class CSUpdateLiveScheduledMatchesSpider(Spider):
 
     def start_requests(self):
         matches = poll_cs2_matches()
+        capture = getattr(self, "capture", None)
         for match in matches:
             if match.match_url:
+                meta = {
+                    "ready_selector": (
+                        'xpath=//div[contains(@class, "score")]'
+                        '/span[contains(@class, "live")]'
+                    ),
+                }
+                if capture:
+                    meta["capture"] = [capture]
                 yield Request(
                     url=match.match_url,
                     callback=self.parse_match,
                     cb_kwargs={"match_id": match.match_id},
-                    meta={"delay": 4},
+                    meta=meta,
                 )
 
-    def parse_match(self, response, match_id, retry_times=0):
+    def parse_match(self, response, match_id):
         """Parse match details for updating."""
+        for captured in response.meta.get("captured", ()):
+            self.logger.info(
+                f"Captured {captured["content_type"]} from {captured["url"]}"
+            )
         match_status = self._get_match_status(response)
-        retry_times = response.meta.get("retry_times", 0)
         team_scores = response.xpath(
             '//div[contains(@class, "score")]/span[contains(@class, "live")]/text()'
         ).getall()
-        if (not team_scores or not match_status) and retry_times < 3:
-            yield Request(
-                url=response.url,
-                callback=self.parse_match,
-                cb_kwargs={"match_id": match_id, "retry_times": retry_times + 1},
-                meta={"delay": 4},
-                dont_filter=True,
-            )
+        if not team_scores or not match_status:
+            self.logger.warning(f"No match data on {response.url}, skipping.")
             return
         pretty_team_names = response.xpath(
             '//div[contains(@class, "teams-on-live")]//h2/text()'
@@ -1,4 +1,5 @@
 import random
+from collections import defaultdict
 
 from scrapy import Request, Spider
 
@@ -15,8 +16,10 @@ class CSUpdateTournamentsSpider(Spider):
         "DOWNLOADER_MIDDLEWARES": {
             "scrapy.downloadermiddlewares.useragent.UserAgentMiddleware": None,
             "scrapy_user_agents.middlewares.RandomUserAgentMiddleware": None,
+            "scrapy.downloadermiddlewares.retry.RetryMiddleware": None,
             "webnews_parser.middlewares.PatchrightMiddleware": 542,
-            "webnews_parser.middlewares.TooManyRequestsRetryMiddleware": 543,
+            "webnews_parser.middlewares.RateLimitMiddleware": 543,
+            "webnews_parser.middlewares.TooManyRequestsRetryMiddleware": 541,
         },
         "ITEM_PIPELINES": {
             "webnews_parser.pipelines.CSUpdateTournamentsPipeline": 100,
@@ -36,41 +39,34 @@ class CSUpdateTournamentsSpider(Spider):
         self.user_agent = random.choice(PLAYWRIGHT_USER_AGENTS)
 
     def start_requests(self):
-        matches = get_matches_with_empty_tournaments()
-        for match in matches:
+        # Matches of the same event share a tournament page, fetch it once
+        match_ids = defaultdict(list)
+        for match in get_matches_with_empty_tournaments():
             if match.tournament_url:
-                yield Request(
-                    match.tournament_url,
-                    callback=self.parse_tournament,
-                    cb_kwargs={"match_id": match.match_id},
-                    meta={"delay": 4},
-                )
+                match_ids[match.tournament_url].append(match.match_id)
 
-    def parse_tournament(self, response, match_id):
-        """Parse tournament details and yield data for updating."""
-        retry_times = response.meta.get("retry_times", 0)
-        max_retries = 3  # Maximum number of retry attempts
+        for tournament_url, tournament_match_ids in match_ids.items():
+            yield Request(
+                tournament_url,
+                callback=self.parse_tournament,
+                cb_kwargs={"match_ids": tournament_match_ids},
+                meta={"ready_selector": "div.hh h1", "render": "handoff"},
+            )
 
+    def parse_tournament(self, response, match_ids):
+        """Parse tournament details and yield them for all waiting matches."""
         # Check if tournament name exists
         tournament_name = response.css("div.hh h1::text").get()
 
-        if not tournament_name and retry_times < max_retries:
-            # If tournament name is missing and we haven't exceeded max retries,
-            # schedule another request
-            yield Request(
-                url=response.url,
-                callback=self.parse_tournament,
-                meta={"delay": 4, "retry_times": retry_times + 1},
-                cb_kwargs={"match_id": match_id},
-                dont_filter=True,
-            )
+        if not tournament_name:
+            self.logger.warning(f"No tournament data on {response.url}, skipping.")
             return
 
         loader = CSUpdateTournamentsLoader(
             item=CSUpdateTournamentsItem(), response=response
         )
 
-        loader.add_value("match_id", match_id)
+        loader.add_value("match_ids", match_ids)
         loader.add_css("tournament_name", "div.hh h1::text")
         loader.add_xpath(
             "tournament_location", "//th[contains(text(),'Dates')]/parent::*/td/text()"
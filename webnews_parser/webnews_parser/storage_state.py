@@ -0,0 +1,151 @@
+"""Browser storage state shared by the contexts of every job."""
+
+import json
+import logging
+from os import getenv
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from time import monotonic, time
+from urllib.parse import urlparse
+
+from patchright.async_api import BrowserContext
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from scrapy.crawler import Crawler
+from scrapy.utils.project import data_path
+
+logger = logging.getLogger(__name__)
+
+
+def _in_domain(host: str, domain: str) -> bool:
+    host = host.lstrip(".")
+    return host == domain or host.endswith(f".{domain}")
+
+
+class StorageStateStore:
+    """
+    Cookies and localStorage of the browser, saved per domain.
+
+    After a navigation that was not a challenge page, the cookies and
+    localStorage of its domain are saved, at most once every
+    ``PATCHRIGHT_STORAGE_STATE_SAVE_INTERVAL`` seconds per domain. Every new
+    browser context starts with the saved state of all domains, so cleared
+    challenges carry over to new contexts, browsers and runs. States expire
+    after ``PATCHRIGHT_STORAGE_STATE_TTL`` seconds.
+
+    States live in Redis if ``PATCHRIGHT_STORAGE_STATE_REDIS_URL`` (or the
+    ``REDIS_URL`` environment variable) is set, otherwise in one JSON file
+    per domain in ``PATCHRIGHT_STORAGE_STATE_DIR``. Either way, every
+    scrapyd job using the same Redis or directory shares them.
+    """
+
+    KEY_PREFIX = "webnews_parser:storage_state:"
+
+    def __init__(self, crawler: Crawler) -> None:
+        """Read the store configuration from the crawler settings."""
+        settings = crawler.settings
+        self.enabled = settings.getbool("PATCHRIGHT_STORAGE_STATE_ENABLED")
+        self.ttl = settings.getint("PATCHRIGHT_STORAGE_STATE_TTL")
+        self.save_interval = settings.getint("PATCHRIGHT_STORAGE_STATE_SAVE_INTERVAL")
+        redis_url = settings.get("PATCHRIGHT_STORAGE_STATE_REDIS_URL") or getenv(
+            "REDIS_URL"
+        )
+        self.redis = Redis.from_url(redis_url) if redis_url else None
+        self.state_dir = Path(data_path(settings["PATCHRIGHT_STORAGE_STATE_DIR"]))
+        self.stats = crawler.stats
+        self._saved: dict[str, float] = {}
+
+    @staticmethod
+    def domain_of(url: str) -> str:
+        """Return the domain the state of the URL is saved under."""
+        return (urlparse(url).hostname or "").removeprefix("www.")
+
+    def is_due(self, url: str) -> bool:
+        """Check whether the state of the URL's domain should be saved again."""
+        saved = self._saved.get(self.domain_of(url))
+        return self.enabled and (
+            saved is None or monotonic() - saved >= self.save_interval
+        )
+
+    async def load(self) -> dict | None:
+        """Return the saved states of all domains merged, or None if empty."""
+        if not self.enabled:
+            return None
+
+        try:
+            states = await (self._load_redis() if self.redis else self._load_files())
+        except (RedisError, OSError) as e:
+            logger.warning(f"Failed to load the browser storage state: {e}")
+            return None
+        if not states:
+            return None
+
+        self.stats.inc_value("patchright/storage_state/loaded")
+        return {
+            "cookies": [cookie for state in states for cookie in state["cookies"]],
+            "origins": [origin for state in states for origin in state["origins"]],
+        }
+
+    async def save(self, context: BrowserContext, url: str) -> None:
+        """Save the cookies and localStorage of the URL's domain."""
+        domain = self.domain_of(url)
+        self._saved[domain] = monotonic()
+        state = await context.storage_state()
+        state = {
+            "cookies": [
+                cookie
+                for cookie in state["cookies"]
+                if _in_domain(cookie["domain"], domain)
+            ],
+            "origins": [
+                origin
+                for origin in state["origins"]
+                if _in_domain(urlparse(origin["origin"]).hostname or "", domain)
+            ],
+        }
+        if not state["cookies"] and not state["origins"]:
+            return
+
+        data = json.dumps(state)
+        try:
+            if self.redis:
+                await self.redis.set(self.KEY_PREFIX + domain, data, ex=self.ttl)
+            else:
+                self._save_file(domain, data)
+        except (RedisError, OSError) as e:
+            logger.warning(f"Failed to save the browser storage state: {e}")
+            return
+        self.stats.inc_value("patchright/storage_state/saved")
+
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        if self.redis:
+            await self.redis.aclose()
+
+    async def _load_redis(self) -> list[dict]:
+        keys = [key async for key in self.redis.scan_iter(f"{self.KEY_PREFIX}*")]
+        if not keys:
+            return []
+        return [json.loads(value) for value in await self.redis.mget(keys) if value]
+
+    async def _load_files(self) -> list[dict]:
+        states = []
+        for path in self.state_dir.glob("*.json"):
+            try:
+                if time() - path.stat().st_mtime > self.ttl:
+                    path.unlink(missing_ok=True)
+                    continue
+                states.append(json.loads(path.read_text(encoding="utf-8")))
+            except (FileNotFoundError, ValueError):
+                continue
+        return states
+
+    def _save_file(self, domain: str, data: str) -> None:
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first, so that concurrent jobs never read
+        # a partially written state.
+        with NamedTemporaryFile(
+            "w", encoding="utf-8", dir=self.state_dir, delete=False
+        ) as tmp:
+            tmp.write(data)
+        Path(tmp.name).replace(self.state_dir / f"{domain}.json")
@@ -1,8 +1,17 @@
+import asyncio
+import json
+from collections.abc import Iterable
+from time import monotonic
+from typing import Any
+
 from flux_orm import Competition, MatchStatus
 from flux_orm.database import new_session, new_sync_session
-from flux_orm.models.models import Match, Sport
-from sqlalchemy import asc, desc, select
-from sqlalchemy.orm import class_mapper, RelationshipProperty
+from flux_orm.models.models import Match, RawNews, Sport
+from sqlalchemy import asc, column, desc, inspect, JSON, Select, select, table, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import class_mapper, InstrumentedAttribute, RelationshipProperty
+from sqlalchemy.sql.expression import TableClause
 
 
 def update_object(obj, data: dict):
@@ -31,6 +40,115 @@ def update_object(obj, data: dict):
         setattr(obj, key, value)
 
 
+def primary_key(obj: Any) -> Any:
+    """Get the primary key value of a persistent or flushed ORM object."""
+    return inspect(obj).identity[0]
+
+
+async def link_rows(
+    session: AsyncSession,
+    relationship: InstrumentedAttribute,
+    pairs: Iterable[tuple[Any, Any]],
+) -> None:
+    """
+    Link objects of a many-to-many relationship by their primary keys.
+
+    The rows are inserted straight into the association table in a single
+    statement; pairs that are already linked are ignored.
+
+    Args:
+        session (AsyncSession): The session to execute the insert in.
+        relationship (InstrumentedAttribute): The many-to-many relationship,
+            for example ``Team.members``.
+        pairs (Iterable[tuple]): ``(parent_id, child_id)`` pairs to link.
+
+    """
+    prop = relationship.property
+    parent_column = prop.synchronize_pairs[0][1].name
+    child_column = prop.secondary_synchronize_pairs[0][1].name
+    rows = [{parent_column: parent, child_column: child} for parent, child in pairs]
+    if rows:
+        await session.execute(
+            insert(prop.secondary).values(rows).on_conflict_do_nothing()
+        )
+
+
+async def link_rows_from_select(
+    session: AsyncSession,
+    relationship: InstrumentedAttribute,
+    pairs: Select,
+) -> None:
+    """
+    Link objects of a many-to-many relationship to the rows of a select.
+
+    Unlike ``link_rows`` the pairs never leave the database: they are inserted
+    into the association table with ``INSERT ... SELECT``, ignoring pairs that
+    are already linked.
+
+    Args:
+        session (AsyncSession): The session to execute the insert in.
+        relationship (InstrumentedAttribute): The many-to-many relationship,
+            for example ``Team.competitions``.
+        pairs (Select): A select of ``(parent_id, child_id)`` rows.
+
+    """
+    prop = relationship.property
+    parent_column = prop.synchronize_pairs[0][1].name
+    child_column = prop.secondary_synchronize_pairs[0][1].name
+    await session.execute(
+        insert(prop.secondary)
+        .from_select([parent_column, child_column], pairs.distinct())
+        .on_conflict_do_nothing()
+    )
+
+
+async def copy_to_staging(
+    session: AsyncSession,
+    name: str,
+    shape: Select,
+    records: Iterable[tuple],
+) -> TableClause:
+    """
+    Bulk load records into a temporary table with ``COPY``.
+
+    The table gets the column names and types of ``shape`` and is dropped when
+    the transaction of the session ends. JSON values are serialized, every
+    other value is handed to asyncpg as is.
+
+    Args:
+        session (AsyncSession): The session whose transaction is used.
+        name (str): The name of the temporary table.
+        shape (Select): A select whose columns define the staging table.
+        records (Iterable[tuple]): The rows, in the column order of ``shape``.
+
+    Returns:
+        TableClause: The staging table, to be used in further statements.
+
+    """
+    connection = await session.connection()
+    query = shape.compile(dialect=connection.dialect)
+    await session.execute(
+        text(f"CREATE TEMPORARY TABLE {name} ON COMMIT DROP AS {query} WITH NO DATA")
+    )
+
+    columns = list(shape.selected_columns.keys())
+    json_columns = [
+        isinstance(selected.type, JSON) for selected in shape.selected_columns
+    ]
+    rows = [
+        tuple(
+            json.dumps(value) if is_json and value is not None else value
+            for value, is_json in zip(record, json_columns, strict=True)
+        )
+        for record in records
+    ]
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        name, records=rows, columns=columns
+    )
+    return table(name, *(column(key) for key in columns))
+
+
 async def poll_latest_match() -> Match:
     """Get the most recently added match from the database asynchronously."""
     async with new_session() as session:
@@ -55,6 +173,68 @@ async def poll_sport_by_name(name: str) -> Sport:
         return result.scalar_one_or_none()
 
 
+class ReferenceDataCache:
+    """
+    Process-local cache of static lookup rows.
+
+    Sports never change during a crawl, so their ids are loaded once and
+    served from memory until the TTL passes or the cache is invalidated.
+    """
+
+    def __init__(self, ttl: float = 3600) -> None:
+        """Create an empty cache whose entries live for ``ttl`` seconds."""
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._sport_ids: dict[str, Any] = {}
+        self._loaded_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    def is_fresh(self) -> bool:
+        """Check whether the cached rows are loaded and younger than the TTL."""
+        return self._loaded_at is not None and monotonic() - self._loaded_at < self.ttl
+
+    async def warm_up(self) -> None:
+        """Load all sports from the database."""
+        async with new_session() as session:
+            result = await session.execute(select(Sport.name, Sport.sport_id))
+            self._sport_ids = dict(result.tuples().all())
+        self._loaded_at = monotonic()
+
+    def invalidate(self) -> None:
+        """Drop the cached rows, so the next lookup reloads them."""
+        self._sport_ids = {}
+        self._loaded_at = None
+
+    async def get_sport_id(self, name: str) -> Any:
+        """Get the id of a sport by its name."""
+        if self.is_fresh() and name in self._sport_ids:
+            self.hits += 1
+            return self._sport_ids[name]
+
+        self.misses += 1
+        async with self._lock:
+            if not self.is_fresh() or name not in self._sport_ids:
+                await self.warm_up()
+        return self._sport_ids.get(name)
+
+
+reference_cache = ReferenceDataCache()
+
+
+async def get_sport_id(name: str) -> Any:
+    """Get the id of a sport by its name from the reference data cache."""
+    return await reference_cache.get_sport_id(name)
+
+
+async def poll_known_news_urls() -> set[str]:
+    """Get the URLs of all stored news articles that have text."""
+    async with new_session() as session:
+        stmt = select(RawNews.url).filter(RawNews.text.isnot(None))
+        result = await session.execute(stmt)
+        return set(result.scalars().all())
+
+
 def poll_cs2_matches() -> list[Match]:
     """Get all CS2 matches that have an associated competition."""
     with new_sync_session() as session:
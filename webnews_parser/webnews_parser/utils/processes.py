@@ -0,0 +1,107 @@
+"""Process lookups through /proc, for watching the browser processes."""
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+PROC = Path("/proc")
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+CHROMIUM_NAMES = ("chrome", "chromium", "headless_shell")
+
+
+@dataclass
+class Process:
+    """A process as read from /proc."""
+
+    pid: int
+    ppid: int
+    uid: int
+    cmdline: list[str]
+
+    @property
+    def is_chromium(self) -> bool:
+        """Check whether the process is a Chromium browser or helper process."""
+        if not self.cmdline:
+            return False
+        name = Path(self.cmdline[0]).name
+        return any(chromium in name for chromium in CHROMIUM_NAMES)
+
+    @property
+    def is_driver(self) -> bool:
+        """Check whether the process is a Playwright/Patchright node driver."""
+        return "run-driver" in self.cmdline
+
+
+def process_table() -> dict[int, Process]:
+    """
+    Read every running process.
+
+    Returns:
+        dict[int, Process]: Processes by PID; those that exit while being read
+        are left out.
+
+    """
+    processes = {}
+    for entry in PROC.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+            cmdline = (entry / "cmdline").read_bytes()
+            uid = entry.stat().st_uid
+        except OSError:
+            continue
+        # The command name in parentheses may contain spaces and parentheses
+        ppid = int(stat[stat.rindex(")") + 2 :].split()[1])
+        processes[int(entry.name)] = Process(
+            pid=int(entry.name),
+            ppid=ppid,
+            uid=uid,
+            cmdline=[
+                arg.decode(errors="replace") for arg in cmdline.split(b"\0") if arg
+            ],
+        )
+    return processes
+
+
+def descendants(pid: int, processes: dict[int, Process]) -> list[Process]:
+    """
+    Return every process below the given one in the process tree.
+
+    Args:
+        pid (int): PID of the root process.
+        processes (dict[int, Process]): Process table from process_table().
+
+    Returns:
+        list[Process]: Children, grandchildren and so on.
+
+    """
+    children: dict[int, list[Process]] = {}
+    for process in processes.values():
+        children.setdefault(process.ppid, []).append(process)
+
+    found = []
+    pending = [pid]
+    while pending:
+        for child in children.get(pending.pop(), []):
+            found.append(child)
+            pending.append(child.pid)
+    return found
+
+
+def rss_bytes(pid: int) -> int:
+    """
+    Return the resident set size of a process.
+
+    Args:
+        pid (int): PID of the process.
+
+    Returns:
+        int: RSS in bytes, or 0 if the process is gone.
+
+    """
+    try:
+        statm = (PROC / str(pid) / "statm").read_text()
+    except OSError:
+        return 0
+    return int(statm.split()[1]) * PAGE_SIZE
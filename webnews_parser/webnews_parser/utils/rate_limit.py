@@ -0,0 +1,144 @@
+"""Per-domain token buckets shared by every job through Redis."""
+
+import logging
+from os import getenv
+from time import monotonic
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from scrapy.settings import BaseSettings
+
+logger = logging.getLogger(__name__)
+
+# Takes one token from the bucket in KEYS[1], refilled at ARGV[1] tokens per
+# second up to ARGV[2] tokens. The bucket may go negative: the caller reserves
+# the next free token and gets back the seconds to wait for it, so waiting
+# callers never race each other for the same token. Redis' clock is used, so
+# jobs on different nodes agree on the refill.
+# S105 reads the TOKEN in the name as a password; the value is a Lua script.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call("TIME")
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "updated")
+local tokens = tonumber(bucket[1]) or burst
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(now - updated, 0) * rate) - 1
+redis.call("HSET", KEYS[1], "tokens", tokens, "updated", now)
+redis.call("EXPIRE", KEYS[1], math.ceil((burst - tokens) / rate) + 1)
+if tokens >= 0 then
+    return "0"
+end
+return tostring(-tokens / rate)
+"""  # noqa: S105
+
+
+class MemoryTokenBucket:
+    """The token bucket of ``TOKEN_BUCKET_SCRIPT``, local to this process."""
+
+    def __init__(self, rate: float, burst: float) -> None:
+        """Start with a full bucket."""
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = monotonic()
+
+    def acquire(self) -> float:
+        """Reserve a token and return the seconds to wait for it."""
+        now = monotonic()
+        elapsed = now - self.updated
+        self.tokens = min(self.burst, self.tokens + elapsed * self.rate) - 1
+        self.updated = now
+        return max(-self.tokens / self.rate, 0)
+
+
+class RateLimiter:
+    """
+    Request budget per domain, shared by all jobs that use the same Redis.
+
+    Every domain gets a token bucket refilled at its rate from ``rates`` (or
+    ``default_rate``) with room for ``burst`` requests. The buckets live in
+    Redis, so scrapyd jobs on every node draw from the same budget. While
+    Redis is unreachable or does not answer within ``timeout`` seconds, or
+    when no Redis URL is configured, each process falls back to its own
+    in-memory buckets and tries Redis again after ``RETRY_INTERVAL`` seconds.
+    """
+
+    KEY_PREFIX = "webnews_parser:ratelimit:"
+    RETRY_INTERVAL = 30  # Seconds before Redis is tried again
+
+    def __init__(
+        self,
+        redis_url: str | None,
+        rates: dict[str, float],
+        default_rate: float,
+        burst: float,
+        timeout: float = 1,
+    ) -> None:
+        """Connect lazily to Redis and prepare the in-memory fallback."""
+        self.rates = rates
+        self.default_rate = default_rate
+        self.burst = burst
+        self.redis = (
+            Redis.from_url(
+                redis_url, socket_timeout=timeout, socket_connect_timeout=timeout
+            )
+            if redis_url
+            else None
+        )
+        self._script = (
+            self.redis.register_script(TOKEN_BUCKET_SCRIPT) if self.redis else None
+        )
+        self._buckets: dict[str, MemoryTokenBucket] = {}
+        self._redis_down_until = 0.0
+
+    @classmethod
+    def from_settings(cls, settings: BaseSettings) -> "RateLimiter":
+        """Create the limiter from the ``RATE_LIMIT_*`` settings."""
+        return cls(
+            settings.get("RATE_LIMIT_REDIS_URL") or getenv("REDIS_URL"),
+            settings.getdict("RATE_LIMIT_RATES"),
+            settings.getfloat("RATE_LIMIT_DEFAULT_RATE"),
+            settings.getfloat("RATE_LIMIT_BURST"),
+            timeout=settings.getfloat("RATE_LIMIT_REDIS_TIMEOUT"),
+        )
+
+    @property
+    def shared(self) -> bool:
+        """Whether the buckets are currently shared through Redis."""
+        return self.redis is not None and monotonic() >= self._redis_down_until
+
+    def rate_for(self, domain: str) -> float:
+        """Return the requests per second allowed for the domain."""
+        return float(self.rates.get(domain, self.default_rate))
+
+    async def acquire(self, domain: str) -> float:
+        """
+        Reserve a request for the domain.
+
+        Returns:
+            float: The seconds to wait before sending the request.
+
+        """
+        domain = domain.removeprefix("www.")
+        rate = self.rate_for(domain)
+        if self.shared:
+            try:
+                wait = await self._script(
+                    keys=[self.KEY_PREFIX + domain], args=[rate, self.burst]
+                )
+                return float(wait)
+            except (RedisError, OSError) as e:
+                logger.warning(f"Rate limiting in memory, Redis is unavailable: {e}")
+                self._redis_down_until = monotonic() + self.RETRY_INTERVAL
+
+        bucket = self._buckets.get(domain)
+        if bucket is None:
+            bucket = self._buckets[domain] = MemoryTokenBucket(rate, self.burst)
+        return bucket.acquire()
+
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        if self.redis:
+            await self.redis.aclose()
@@ -2,7 +2,15 @@ from html import unescape
 import re
 from unicodedata import normalize
 
-from scrapy.http import Response
+from scrapy.http import Response, TextResponse
+
+CHALLENGE_STATUSES = {403, 503}
+CHALLENGE_MARKERS = (
+    b"cf-chl",
+    b"challenge-platform",
+    b"<title>Just a moment...</title>",
+    b"<title>Attention Required!",
+)
 
 
 def css_mutator(selector: str, response: Response) -> str:
@@ -50,6 +58,54 @@ def xpath_mutator_all(selector: str, response: Response) -> list[str]:
     return placeholder or []
 
 
+def is_selector_present(selector: str, response: Response) -> bool:
+    """
+    Check whether a CSS or XPath selector matches anything in the response.
+
+    Args:
+        selector (str): CSS selector, or XPath selector prefixed with "xpath=".
+        response (Response): Response object to check.
+
+    Returns:
+        bool: True if the selector matches at least one node.
+    """
+    if not isinstance(response, TextResponse):
+        return False
+    if selector.startswith("xpath="):
+        return bool(response.xpath(selector.removeprefix("xpath=")))
+    return bool(response.css(selector))
+
+
+def is_challenge_page(response: Response) -> bool:
+    """
+    Check whether the response is an anti-bot challenge instead of the page.
+
+    Args:
+        response (Response): Response object to check.
+
+    Returns:
+        bool: True if the response looks like a challenge page.
+    """
+    if response.status in CHALLENGE_STATUSES:
+        return True
+    return is_challenge_body(response.body)
+
+
+def is_challenge_body(body: bytes | str) -> bool:
+    """
+    Check whether a page body is an anti-bot challenge.
+
+    Args:
+        body (bytes | str): Raw or decoded page body.
+
+    Returns:
+        bool: True if the body contains a challenge marker.
+    """
+    if isinstance(body, str):
+        return any(marker.decode() in body for marker in CHALLENGE_MARKERS)
+    return any(marker in body for marker in CHALLENGE_MARKERS)
+
+
 def clean_text(text: str | None) -> str:
     """
     Clean and format text content.